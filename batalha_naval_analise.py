@@ -0,0 +1,246 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import gzip
+import json
+import sys
+from batalha_naval_replay import GravacaoPartida, mascaras_navios
+
+def ler_gravacoes(caminho):
+    """
+    Le um arquivo de partidas gravadas, uma por vez.
+    
+    O arquivo tem uma GravacaoPartida em JSON por linha; arquivos terminados
+    em .gz sao lidos comprimidos.
+    
+    Args:
+        caminho (str): Caminho do arquivo
+    
+    Yields:
+        GravacaoPartida: Cada partida do arquivo
+    """
+    abrir = gzip.open if caminho.endswith('.gz') else open
+    with abrir(caminho, 'rt', encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            if linha.strip():
+                yield GravacaoPartida.de_dict(json.loads(linha))
+
+def em_blocos(iteravel, tamanho_bloco=10000):
+    """
+    Agrupa um iteravel em listas de tamanho limitado.
+    
+    Args:
+        iteravel (iterable): Elementos a agrupar
+        tamanho_bloco (int, optional): Maximo de elementos por bloco. Padrao eh 10000.
+    
+    Yields:
+        list: Cada bloco de elementos
+    """
+    iterador = iter(iteravel)
+    while True:
+        bloco = list(islice(iterador, tamanho_bloco))
+        if not bloco:
+            return
+        yield bloco
+
+class Agregado:
+    """
+    Estatisticas acumuladas de um conjunto de partidas, com memoria limitada.
+    
+    Guarda apenas contagens: por tamanho de tabuleiro, quantas vezes cada
+    celula foi a primeira a ser acertada; e, por (estrategia, tamanho), o
+    histograma de tiros ate a vitoria, de onde saem media e percentis.
+    Agregados de arquivos diferentes podem ser combinados.
+    """
+    
+    def __init__(self):
+        """Inicializa um agregado vazio."""
+        self.__partidas = 0
+        self.__primeiro_acerto = {}  # tamanho -> Counter(indice da celula -> vezes)
+        self.__tiros_ate_vitoria = {}  # (estrategia, tamanho) -> Counter(tiros -> partidas)
+    
+    @property
+    def partidas(self):
+        """Retorna a quantidade de partidas agregadas."""
+        return self.__partidas
+    
+    def adicionar_bloco(self, gravacoes):
+        """
+        Agrega um bloco de partidas.
+        
+        Os valores do bloco sao extraidos primeiro em listas simples e so
+        entao somados aos contadores de uma vez.
+        
+        Args:
+            gravacoes (list): Partidas gravadas (GravacaoPartida)
+        """
+        primeiros = {}
+        vitorias = {}
+        for gravacao in gravacoes:
+            tamanho = gravacao.tamanho
+            ocupacao = []
+            for frota in gravacao.navios:
+                mascara = 0
+                for navio in mascaras_navios(tamanho, frota):
+                    mascara |= navio
+                ocupacao.append(mascara)
+            
+            # Primeiro acerto de cada atirador e tiros de cada um
+            primeiro = [None, None]
+            tiros = [0, 0]
+            for atirador, linha, coluna in gravacao.tiros:
+                tiros[atirador] += 1
+                if primeiro[atirador] is None:
+                    indice = linha * tamanho + coluna
+                    if ocupacao[1 - atirador] >> indice & 1:
+                        primeiro[atirador] = indice
+            primeiros.setdefault(tamanho, []).extend(indice for indice in primeiro if indice is not None)
+            
+            if gravacao.vencedor is not None:
+                chave = (gravacao.nomes[gravacao.vencedor], tamanho)
+                vitorias.setdefault(chave, []).append(tiros[gravacao.vencedor])
+        
+        for tamanho, indices in primeiros.items():
+            self.__primeiro_acerto.setdefault(tamanho, Counter()).update(indices)
+        for chave, valores in vitorias.items():
+            self.__tiros_ate_vitoria.setdefault(chave, Counter()).update(valores)
+        self.__partidas += len(gravacoes)
+    
+    def combinar(self, outro):
+        """
+        Soma as estatisticas de outro agregado a este.
+        
+        Args:
+            outro (Agregado): Agregado a ser somado
+        """
+        for tamanho, contagens in outro.__primeiro_acerto.items():
+            self.__primeiro_acerto.setdefault(tamanho, Counter()).update(contagens)
+        for chave, histograma in outro.__tiros_ate_vitoria.items():
+            self.__tiros_ate_vitoria.setdefault(chave, Counter()).update(histograma)
+        self.__partidas += outro.__partidas
+    
+    def mapa_primeiro_acerto(self, tamanho=10):
+        """
+        Retorna quantas vezes cada celula foi a primeira a ser acertada.
+        
+        Args:
+            tamanho (int, optional): Tamanho do tabuleiro. Padrao eh 10.
+        
+        Returns:
+            list: Matriz tamanho x tamanho de contagens
+        """
+        contagens = self.__primeiro_acerto.get(tamanho, Counter())
+        return [[contagens[linha * tamanho + coluna] for coluna in range(tamanho)]
+                for linha in range(tamanho)]
+    
+    def grupos(self):
+        """
+        Lista os grupos com histograma de tiros ate a vitoria.
+        
+        Returns:
+            list: Tuplas (estrategia, tamanho) ordenadas
+        """
+        return sorted(self.__tiros_ate_vitoria)
+    
+    def histograma(self, estrategia, tamanho=10):
+        """
+        Retorna o histograma de tiros ate a vitoria de uma estrategia.
+        
+        Args:
+            estrategia (str): Nome da estrategia
+            tamanho (int, optional): Tamanho do tabuleiro. Padrao eh 10.
+        
+        Returns:
+            dict: Tiros ate a vitoria -> quantidade de partidas
+        """
+        return dict(sorted(self.__tiros_ate_vitoria.get((estrategia, tamanho), Counter()).items()))
+    
+    def media(self, estrategia, tamanho=10):
+        """
+        Calcula a media de tiros ate a vitoria de uma estrategia.
+        
+        Args:
+            estrategia (str): Nome da estrategia
+            tamanho (int, optional): Tamanho do tabuleiro. Padrao eh 10.
+        
+        Returns:
+            float: Media de tiros, ou None se nao ha vitorias registradas
+        """
+        histograma = self.__tiros_ate_vitoria.get((estrategia, tamanho))
+        if not histograma:
+            return None
+        return sum(tiros * vezes for tiros, vezes in histograma.items()) / sum(histograma.values())
+    
+    def percentil(self, estrategia, tamanho=10, p=50):
+        """
+        Calcula um percentil de tiros ate a vitoria a partir do histograma.
+        
+        Args:
+            estrategia (str): Nome da estrategia
+            tamanho (int, optional): Tamanho do tabuleiro. Padrao eh 10.
+            p (float, optional): Percentil desejado, de 0 a 100. Padrao eh 50.
+        
+        Returns:
+            int: Menor quantidade de tiros que cobre p% das vitorias, ou None se nao ha vitorias
+        """
+        histograma = self.__tiros_ate_vitoria.get((estrategia, tamanho))
+        if not histograma:
+            return None
+        limite = p / 100 * sum(histograma.values())
+        acumulado = 0
+        for tiros in sorted(histograma):
+            acumulado += histograma[tiros]
+            if acumulado >= limite:
+                return tiros
+        return max(histograma)
+
+def analisar_arquivo(caminho, tamanho_bloco=10000):
+    """
+    Agrega um arquivo de partidas, bloco a bloco.
+    
+    A memoria usada depende do tamanho do bloco, nao do tamanho do arquivo.
+    
+    Args:
+        caminho (str): Caminho do arquivo
+        tamanho_bloco (int, optional): Partidas por bloco. Padrao eh 10000.
+    
+    Returns:
+        Agregado: Estatisticas do arquivo
+    """
+    agregado = Agregado()
+    for bloco in em_blocos(ler_gravacoes(caminho), tamanho_bloco):
+        agregado.adicionar_bloco(bloco)
+    return agregado
+
+def analisar_arquivos(caminhos, processos=None, tamanho_bloco=10000):
+    """
+    Agrega varios arquivos de partidas em paralelo, um arquivo por tarefa.
+    
+    Args:
+        caminhos (list): Caminhos dos arquivos
+        processos (int, optional): Processos trabalhadores; 1 analisa no proprio processo.
+            Padrao eh None (um por CPU).
+        tamanho_bloco (int, optional): Partidas por bloco. Padrao eh 10000.
+    
+    Returns:
+        Agregado: Estatisticas de todos os arquivos
+    """
+    total = Agregado()
+    if processos == 1:
+        for caminho in caminhos:
+            total.combinar(analisar_arquivo(caminho, tamanho_bloco))
+        return total
+    
+    with ProcessPoolExecutor(processos) as executor:
+        for agregado in executor.map(analisar_arquivo, caminhos, [tamanho_bloco] * len(caminhos)):
+            total.combinar(agregado)
+    return total
+
+# Resume os arquivos de partidas informados na linha de comando
+if __name__ == "__main__":
+    agregado = analisar_arquivos(sys.argv[1:])
+    print(f"{agregado.partidas} partidas")
+    for estrategia, tamanho in agregado.grupos():
+        print(f"{estrategia} ({tamanho}x{tamanho}): media {agregado.media(estrategia, tamanho):.2f}, "
+              f"p50 {agregado.percentil(estrategia, tamanho, 50)}, "
+              f"p99 {agregado.percentil(estrategia, tamanho, 99)} tiros por vitoria")
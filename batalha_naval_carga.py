@@ -0,0 +1,317 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from batalha_naval_cluster import ClusterSessoes
+from batalha_naval_servidor import ServidorSessoes, iniciar_servidor_tcp
+
+class TransporteLocal:
+    """Envia os comandos direto para um ServidorSessoes (ou ClusterSessoes) no mesmo processo."""
+    
+    def __init__(self, servidor, executor=None):
+        """
+        Inicializa o transporte.
+        
+        Args:
+            servidor (ServidorSessoes | ClusterSessoes): Servidor que executa os comandos
+            executor (concurrent.futures.Executor, optional): Executor onde os comandos
+                rodam. Padrao eh None (no proprio laco de eventos).
+        """
+        self.__servidor = servidor
+        self.__executor = executor
+    
+    async def conectar(self):
+        """Nao ha conexao a abrir no transporte local."""
+        pass
+    
+    async def enviar(self, comando):
+        """
+        Executa um comando no servidor.
+        
+        Args:
+            comando (dict): Comando do cliente
+        
+        Returns:
+            dict: Resposta do servidor
+        """
+        if self.__executor is None:
+            return self.__servidor.executar(comando)
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, self.__servidor.executar, comando)
+    
+    async def fechar(self):
+        """Nao ha conexao a fechar no transporte local."""
+        pass
+
+class TransporteTCP:
+    """Envia os comandos a um servidor TCP, um JSON por linha."""
+    
+    def __init__(self, host='127.0.0.1', porta=8765):
+        """
+        Inicializa o transporte.
+        
+        Args:
+            host (str, optional): Endereco do servidor. Padrao eh '127.0.0.1'.
+            porta (int, optional): Porta do servidor. Padrao eh 8765.
+        """
+        self.__host = host
+        self.__porta = porta
+        self.__leitor = None
+        self.__escritor = None
+    
+    async def conectar(self):
+        """Abre a conexao com o servidor."""
+        self.__leitor, self.__escritor = await asyncio.open_connection(self.__host, self.__porta)
+    
+    async def enviar(self, comando):
+        """
+        Envia um comando e espera a resposta.
+        
+        Args:
+            comando (dict): Comando do cliente
+        
+        Returns:
+            dict: Resposta do servidor
+        """
+        self.__escritor.write(json.dumps(comando).encode() + b'\n')
+        await self.__escritor.drain()
+        return json.loads(await self.__leitor.readline())
+    
+    async def fechar(self):
+        """Fecha a conexao com o servidor."""
+        if self.__escritor is not None:
+            self.__escritor.close()
+            await self.__escritor.wait_closed()
+
+class ClienteSintetico:
+    """
+    Cliente roteirizado que joga como um jogador humano no Jogo.
+    
+    Posiciona os navios um a um, tentando outra posicao quando o servidor
+    recusa, e depois atira em posicoes ainda nao atacadas ate a partida
+    terminar, opcionalmente com uma pausa de "reflexao" antes de cada tiro.
+    No modo salva, cada turno dispara um tiro por navio proprio a flutuar.
+    """
+    
+    def __init__(self, transporte, tamanho=10, pausa=0.0, salva=False):
+        """
+        Inicializa o cliente.
+        
+        Args:
+            transporte (TransporteLocal | TransporteTCP): Canal com o servidor
+            tamanho (int, optional): Tamanho do tabuleiro. Padrao eh 10.
+            pausa (float, optional): Segundos de espera antes de cada tiro. Padrao eh 0.
+            salva (bool, optional): Se True, joga no modo salva. Padrao eh False.
+        """
+        self.__transporte = transporte
+        self.__tamanho = tamanho
+        self.__pausa = pausa
+        self.__salva = salva
+        self.__latencias = []
+    
+    @property
+    def latencias(self):
+        """Retorna a latencia de cada jogada (um tiro ou uma salva), em segundos."""
+        return self.__latencias
+    
+    async def jogar(self):
+        """
+        Joga uma partida completa e encerra a sessao.
+        
+        Returns:
+            int: Vencedor da partida (0 o cliente, 1 a IA)
+        
+        Raises:
+            RuntimeError: Se o servidor recusar um comando valido
+        """
+        transporte = self.__transporte
+        await transporte.conectar()
+        try:
+            id_sessao = self.__verificar(await transporte.enviar({'acao': 'criar', 'salva': self.__salva}))['sessao']
+            
+            pendentes = 5
+            while pendentes:
+                resposta = self.__verificar(await transporte.enviar({
+                    'acao': 'posicionar', 'sessao': id_sessao,
+                    'orientacao': random.choice(['horizontal', 'vertical']),
+                    'linha': random.randrange(self.__tamanho),
+                    'coluna': random.randrange(self.__tamanho)}))
+                pendentes = resposta['pendentes']
+            
+            alvos = [(linha, coluna) for linha in range(self.__tamanho) for coluna in range(self.__tamanho)]
+            random.shuffle(alvos)
+            navios_restantes = 5
+            while alvos:
+                if self.__pausa:
+                    await asyncio.sleep(self.__pausa)
+                if self.__salva:
+                    tiros, alvos = alvos[:navios_restantes], alvos[navios_restantes:]
+                    comando = {'acao': 'atirar_salva', 'sessao': id_sessao, 'tiros': tiros}
+                else:
+                    linha, coluna = alvos.pop()
+                    comando = {'acao': 'atirar', 'sessao': id_sessao, 'linha': linha, 'coluna': coluna}
+                inicio = time.perf_counter()
+                resposta = self.__verificar(await transporte.enviar(comando))
+                self.__latencias.append(time.perf_counter() - inicio)
+                if resposta['vencedor'] is not None:
+                    break
+                if self.__salva:
+                    navios_restantes -= sum(1 for resultado in resposta['resultados_ia'] if resultado['afundou'])
+            
+            await transporte.enviar({'acao': 'encerrar', 'sessao': id_sessao})
+            return resposta['vencedor']
+        finally:
+            await transporte.fechar()
+    
+    def __verificar(self, resposta):
+        """
+        Confere se o servidor aceitou o comando.
+        
+        Args:
+            resposta (dict): Resposta do servidor
+        
+        Returns:
+            dict: A propria resposta
+        
+        Raises:
+            RuntimeError: Se a resposta indicar erro
+        """
+        if not resposta.get('ok'):
+            raise RuntimeError(resposta.get('erro'))
+        return resposta
+
+def percentil(valores_ordenados, p):
+    """
+    Retorna um percentil de uma lista ja ordenada.
+    
+    Args:
+        valores_ordenados (list): Valores em ordem crescente
+        p (float): Percentil desejado, de 0 a 100
+    
+    Returns:
+        float: Valor do percentil
+    """
+    indice = min(len(valores_ordenados) - 1, int(p / 100 * len(valores_ordenados)))
+    return valores_ordenados[indice]
+
+def medir_memoria_por_sessao(sessoes=1000, tamanho=10, esparso=False):
+    """
+    Mede a memoria alocada por sessao com a frota posicionada e metade dos tiros dados.
+    
+    Args:
+        sessoes (int, optional): Sessoes criadas para a medicao. Padrao eh 1000.
+        tamanho (int, optional): Tamanho dos tabuleiros. Padrao eh 10.
+        esparso (bool, optional): Se True, as sessoes usam TabuleiroEsparso. Padrao eh False.
+    
+    Returns:
+        float: Bytes por sessao
+    """
+    tracemalloc.start()
+    try:
+        inicio = tracemalloc.get_traced_memory()[0]
+        servidor = ServidorSessoes(tamanho, esparso)
+        alvos = [(linha, coluna) for linha in range(tamanho) for coluna in range(tamanho)]
+        for _ in range(sessoes):
+            sessao = servidor.criar_sessao()
+            sessao.posicionar_aleatoriamente()
+            for linha, coluna in random.sample(alvos, len(alvos) // 2):
+                if sessao.vencedor is not None:
+                    break
+                sessao.atirar(linha, coluna)
+        return (tracemalloc.get_traced_memory()[0] - inicio) / sessoes
+    finally:
+        tracemalloc.stop()
+
+async def executar_carga(clientes=1000, simultaneos=200, tcp=False, host='127.0.0.1', porta=0,
+                         tamanho=10, esparso=False, pausa=0.0, salva=False, trabalhadores=0):
+    """
+    Dispara clientes sinteticos contra um servidor de sessoes e mede o desempenho.
+    
+    Sem host externo, o servidor roda no mesmo processo: chamado diretamente
+    (tcp=False) ou por TCP em localhost (tcp=True). Com trabalhadores, as
+    sessoes ficam em um ClusterSessoes, com os comandos despachados por um
+    pool de threads para que os processos trabalhadores atendam em paralelo.
+    
+    Args:
+        clientes (int, optional): Quantidade de partidas a jogar. Padrao eh 1000.
+        simultaneos (int, optional): Maximo de clientes jogando ao mesmo tempo. Padrao eh 200.
+        tcp (bool, optional): Se True, os clientes se conectam por TCP. Padrao eh False.
+        host (str, optional): Endereco do servidor TCP. Padrao eh '127.0.0.1'.
+        porta (int, optional): Porta de um servidor TCP ja em execucao; 0 sobe um
+            servidor local em uma porta livre. Padrao eh 0.
+        tamanho (int, optional): Tamanho dos tabuleiros. Padrao eh 10.
+        esparso (bool, optional): Se True, as sessoes usam TabuleiroEsparso. Padrao eh False.
+        pausa (float, optional): Segundos de "reflexao" antes de cada tiro. Padrao eh 0.
+        salva (bool, optional): Se True, as partidas sao do modo salva. Padrao eh False.
+        trabalhadores (int, optional): Processos trabalhadores do servidor local;
+            0 usa um ServidorSessoes no proprio processo. Padrao eh 0.
+    
+    Returns:
+        dict: Latencias p50/p99 das jogadas (ms), sessoes e jogadas por segundo
+    """
+    executor = None
+    if trabalhadores and not (tcp and porta != 0):
+        servidor = ClusterSessoes(trabalhadores, tamanho, esparso)
+        executor = ThreadPoolExecutor(max_workers=4 * trabalhadores)
+    else:
+        servidor = ServidorSessoes(tamanho, esparso)
+    servidor_tcp = None
+    if tcp and porta == 0:
+        servidor_tcp = await iniciar_servidor_tcp(servidor, host, 0, executor)
+        porta = servidor_tcp.sockets[0].getsockname()[1]
+    
+    limite = asyncio.Semaphore(simultaneos)
+    latencias = []
+    
+    async def jogar_cliente():
+        async with limite:
+            transporte = TransporteTCP(host, porta) if tcp else TransporteLocal(servidor, executor)
+            cliente = ClienteSintetico(transporte, tamanho, pausa, salva)
+            await cliente.jogar()
+            latencias.extend(cliente.latencias)
+    
+    inicio = time.perf_counter()
+    try:
+        await asyncio.gather(*(jogar_cliente() for _ in range(clientes)))
+    finally:
+        if servidor_tcp is not None:
+            servidor_tcp.close()
+            await servidor_tcp.wait_closed()
+        if executor is not None:
+            executor.shutdown()
+            servidor.encerrar()
+    duracao = time.perf_counter() - inicio
+    
+    latencias.sort()
+    return {
+        'p50_ms': percentil(latencias, 50) * 1000,
+        'p99_ms': percentil(latencias, 99) * 1000,
+        'sessoes_por_s': clientes / duracao,
+        'jogadas_por_s': len(latencias) / duracao,
+    }
+
+# Executa o teste de carga pela linha de comando
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Teste de carga do servidor de sessoes da Batalha Naval.")
+    parser.add_argument('--clientes', type=int, default=1000, help="partidas a jogar")
+    parser.add_argument('--simultaneos', type=int, default=200, help="clientes jogando ao mesmo tempo")
+    parser.add_argument('--tcp', action='store_true', help="conecta os clientes por TCP")
+    parser.add_argument('--host', default='127.0.0.1', help="endereco do servidor TCP")
+    parser.add_argument('--porta', type=int, default=0, help="porta de um servidor ja em execucao")
+    parser.add_argument('--esparso', action='store_true', help="usa TabuleiroEsparso nas sessoes")
+    parser.add_argument('--pausa', type=float, default=0.0, help="segundos antes de cada tiro")
+    parser.add_argument('--salva', action='store_true', help="joga as partidas no modo salva")
+    parser.add_argument('--trabalhadores', type=int, default=0, help="processos trabalhadores do servidor local")
+    argumentos = parser.parse_args()
+    
+    resultado = asyncio.run(executar_carga(argumentos.clientes, argumentos.simultaneos, argumentos.tcp,
+                                           argumentos.host, argumentos.porta, esparso=argumentos.esparso,
+                                           pausa=argumentos.pausa, salva=argumentos.salva,
+                                           trabalhadores=argumentos.trabalhadores))
+    print(f"Latencia por jogada: p50 {resultado['p50_ms']:.3f} ms, p99 {resultado['p99_ms']:.3f} ms")
+    print(f"{resultado['sessoes_por_s']:.1f} sessoes/s, {resultado['jogadas_por_s']:.0f} jogadas/s")
+    if argumentos.porta == 0:
+        memoria = medir_memoria_por_sessao(esparso=argumentos.esparso)
+        print(f"Memoria por sessao: {memoria / 1024:.1f} KiB")
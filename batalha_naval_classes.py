@@ -65,6 +65,9 @@ class Navio(ABC):
         self.__nome = nome
         self.__posicoes = []
         self.__orientacao = None  # 'horizontal' ou 'vertical'
+        self.__inicio = None  # (linha, coluna) quando guardado como segmento
+        self.__acertos = 0  # bitmask das celulas atingidas do segmento
+        self.__posicoes_geradas = None  # posicoes do segmento, criadas na primeira consulta
     
     @property
     def tamanho(self):
@@ -78,9 +81,23 @@ class Navio(ABC):
     
     @property
     def posicoes(self):
-        """Retorna as posicoes ocupadas pelo navio."""
+        """
+        Retorna as posicoes ocupadas pelo navio.
+        
+        Para um segmento, as posicoes sao criadas na primeira consulta, com o
+        estado de atingida de cada celula, e mantidas em dia pelos tiros seguintes.
+        """
+        if self.__inicio is not None:
+            if self.__posicoes_geradas is None:
+                self.__posicoes_geradas = self.__posicoes_segmento()
+            return self.__posicoes_geradas
         return self.__posicoes
     
+    @property
+    def inicio(self):
+        """Retorna a celula inicial do segmento, ou None se o navio usa posicoes."""
+        return self.__inicio
+    
     @property
     def orientacao(self):
         """Retorna a orientação do navio."""
@@ -97,9 +114,43 @@ class Navio(ABC):
         
         Args:
             posicao (Posicao): posicao a ser adicionada
+        
+        Raises:
+            ValueError: Se o navio ja foi posicionado como segmento
         """
+        if self.__inicio is not None:
+            raise ValueError(f"{self.nome} foi posicionado como segmento; use posicionar_segmento().")
         self.__posicoes.append(posicao)
     
+    def posicionar_segmento(self, linha, coluna, orientacao):
+        """
+        Posiciona o navio como um segmento (inicio, tamanho e orientacao),
+        sem criar uma Posicao para cada celula ocupada.
+        
+        Args:
+            linha (int): Linha inicial do navio
+            coluna (int): Coluna inicial do navio
+            orientacao (str): Orientação do navio ('horizontal' ou 'vertical')
+        """
+        self.__inicio = (linha, coluna)
+        self.__orientacao = orientacao
+        self.__acertos = 0
+        self.__posicoes_geradas = None
+    
+    def celulas(self):
+        """
+        Retorna as coordenadas ocupadas pelo navio.
+        
+        Returns:
+            list: Lista de tuplas (linha, coluna)
+        """
+        if self.__inicio is None:
+            return [(pos.linha, pos.coluna) for pos in self.__posicoes]
+        linha, coluna = self.__inicio
+        if self.__orientacao == 'horizontal':
+            return [(linha, coluna + i) for i in range(self.__tamanho)]
+        return [(linha + i, coluna) for i in range(self.__tamanho)]
+    
     def esta_afundado(self):
         """
         Verifica se o navio está afundado.
@@ -107,6 +158,8 @@ class Navio(ABC):
         Returns:
             bool: True se todas as posicoes foram atingidas, False caso contrário
         """
+        if self.__inicio is not None:
+            return self.__acertos == (1 << self.__tamanho) - 1
         return all(posicao.atingida for posicao in self.__posicoes)
     
     def receber_tiro(self, posicao):
@@ -119,12 +172,57 @@ class Navio(ABC):
         Returns:
             bool: True se o tiro acertou o navio, False caso contrário
         """
+        if self.__inicio is not None:
+            deslocamento = self.__deslocamento(posicao.linha, posicao.coluna)
+            if deslocamento < 0:
+                return False
+            self.__acertos |= 1 << deslocamento
+            if self.__posicoes_geradas is not None:
+                self.__posicoes_geradas[deslocamento].atingida = True
+            return True
+        
         for pos in self.__posicoes:
             if pos == posicao:
                 pos.atingida = True
                 return True
         return False
     
+    def __deslocamento(self, linha, coluna):
+        """
+        Calcula o indice de uma celula dentro do segmento do navio.
+        
+        Args:
+            linha (int): Linha da celula
+            coluna (int): Coluna da celula
+        
+        Returns:
+            int: Indice da celula no segmento, ou -1 se nao pertence ao navio
+        """
+        inicio_linha, inicio_coluna = self.__inicio
+        if self.__orientacao == 'horizontal':
+            deslocamento = coluna - inicio_coluna
+            if linha != inicio_linha:
+                return -1
+        else:
+            deslocamento = linha - inicio_linha
+            if coluna != inicio_coluna:
+                return -1
+        return deslocamento if 0 <= deslocamento < self.__tamanho else -1
+    
+    def __posicoes_segmento(self):
+        """
+        Gera as posicoes do segmento com o estado de atingida de cada celula.
+        
+        Returns:
+            list: Lista de objetos Posicao
+        """
+        posicoes = []
+        for i, (linha, coluna) in enumerate(self.celulas()):
+            pos = Posicao(linha, coluna)
+            pos.atingida = bool(self.__acertos >> i & 1)
+            posicoes.append(pos)
+        return posicoes
+    
     def __str__(self):
         """
         Sobrecarga do operador de string.
@@ -170,6 +268,38 @@ class Destroyer(Navio):
         """Inicializa um destroyer."""
         super().__init__(1, "Destroyer")
 
+def criar_frota_padrao():
+    """
+    Cria a frota padrao do jogo.
+    
+    Returns:
+        list: Lista com um navio de cada tipo, do maior para o menor
+    """
+    return [
+        PortaAvioes(),
+        Encouracado(),
+        Cruzador(),
+        Submarino(),
+        Destroyer()
+    ]
+
+def posicionar_frota_aleatoria(tabuleiro, navios):
+    """
+    Posiciona os navios no tabuleiro de forma aleatoria.
+    
+    Args:
+        tabuleiro (Tabuleiro): Tabuleiro onde os navios serao posicionados
+        navios (list): Navios a serem posicionados
+    """
+    for navio in navios:
+        while True:
+            linha = random.randint(0, tabuleiro.tamanho - 1)
+            coluna = random.randint(0, tabuleiro.tamanho - 1)
+            orientacao = random.choice(['horizontal', 'vertical'])
+            
+            if tabuleiro.adicionar_navio(navio, linha, coluna, orientacao):
+                break
+
 class Tabuleiro:
     """Representa o tabuleiro do jogo."""
     
@@ -276,6 +406,41 @@ class Tabuleiro:
         
         return (False, None)
     
+    def receber_salva(self, tiros):
+        """
+        Recebe uma salva de tiros de uma vez.
+        
+        Os tiros ja feitos e as celulas dos navios sao indexados uma unica vez
+        para toda a salva, em vez de percorrer as listas a cada tiro.
+        
+        Args:
+            tiros (list): Coordenadas (linha, coluna) dos tiros, na ordem de disparo
+        
+        Returns:
+            list: Uma tupla (bool, Navio, bool) por tiro - se acertou, o navio
+                  atingido (ou None) e se esse tiro afundou o navio
+        """
+        ja_atirados = {(tiro.linha, tiro.coluna) for tiro in self.__tiros}
+        celulas = {celula: navio for navio in self.__navios for celula in navio.celulas()}
+        
+        resultados = []
+        for linha, coluna in tiros:
+            chave = (linha, coluna)
+            if not self.__posicao_valida(linha, coluna) or chave in ja_atirados:
+                resultados.append((False, None, False))
+                continue
+            
+            posicao = Posicao(linha, coluna)
+            ja_atirados.add(chave)
+            self.__tiros.append(posicao)
+            navio = celulas.get(chave)
+            if navio is None:
+                resultados.append((False, None, False))
+                continue
+            navio.receber_tiro(posicao)
+            resultados.append((True, navio, navio.esta_afundado()))
+        return resultados
+    
     def todos_navios_afundados(self):
         """
         Verifica se todos os navios estão afundados.
@@ -365,4 +530,214 @@ class Tabuleiro:
             for pos in navio.posicoes:
                 if pos == posicao:
                     return True
-        return False
\ No newline at end of file
+        return False
+
+class TabuleiroEsparso:
+    """
+    Representa um tabuleiro esparso, indicado para tabuleiros grandes e
+    majoritariamente vazios.
+    
+    Os navios sao guardados como segmentos e um mapa hash celula -> navio
+    responde as consultas em O(1); a memoria cresce com a quantidade de
+    navios e tiros, e nao com a area do tabuleiro.
+    """
+    
+    def __init__(self, tamanho=10):
+        """
+        Inicializa um tabuleiro esparso com tamanho específico.
+        
+        Args:
+            tamanho (int, optional): Tamanho do tabuleiro. Padrão é 10.
+        """
+        self.__tamanho = tamanho
+        self.__navios = []
+        self.__celulas = {}  # (linha, coluna) -> Navio
+        self.__tiros = {}  # (linha, coluna) -> acertou, na ordem dos disparos
+        self.__navios_ativos = 0
+    
+    @property
+    def tamanho(self):
+        """Retorna o tamanho do tabuleiro."""
+        return self.__tamanho
+    
+    @property
+    def navios(self):
+        """Retorna os navios no tabuleiro."""
+        return self.__navios
+    
+    @property
+    def tiros(self):
+        """Retorna os tiros no tabuleiro, com atingida nos que acertaram um navio."""
+        tiros = []
+        for (linha, coluna), acertou in self.__tiros.items():
+            posicao = Posicao(linha, coluna)
+            posicao.atingida = acertou
+            tiros.append(posicao)
+        return tiros
+    
+    def adicionar_navio(self, navio, linha, coluna, orientacao):
+        """
+        Adiciona um navio ao tabuleiro.
+        
+        Args:
+            navio (Navio): Navio a ser adicionado
+            linha (int): Linha inicial do navio
+            coluna (int): Coluna inicial do navio
+            orientacao (str): Orientação do navio ('horizontal' ou 'vertical')
+        
+        Returns:
+            bool: True se o navio foi adicionado com sucesso, False caso contrário
+        """
+        if not self.__posicao_valida(linha, coluna):
+            return False
+        
+        # Verifica se o navio cabe no tabuleiro
+        if orientacao == 'horizontal' and coluna + navio.tamanho > self.__tamanho:
+            return False
+        elif orientacao == 'vertical' and linha + navio.tamanho > self.__tamanho:
+            return False
+        
+        if orientacao == 'horizontal':
+            celulas = [(linha, coluna + i) for i in range(navio.tamanho)]
+        else:  # vertical
+            celulas = [(linha + i, coluna) for i in range(navio.tamanho)]
+        
+        # Verifica se há sobreposicao com outros navios
+        for celula in celulas:
+            if celula in self.__celulas:
+                return False
+        
+        # Adiciona o navio ao tabuleiro como um segmento
+        navio.posicionar_segmento(linha, coluna, orientacao)
+        for celula in celulas:
+            self.__celulas[celula] = navio
+        
+        self.__navios.append(navio)
+        self.__navios_ativos += 1
+        return True
+    
+    def receber_tiro(self, linha, coluna):
+        """
+        Recebe um tiro no tabuleiro.
+        
+        Args:
+            linha (int): Linha do tiro
+            coluna (int): Coluna do tiro
+        
+        Returns:
+            tuple: (bool, Navio) - True se acertou um navio, False caso contrário.
+                   O navio atingido se houver, None caso contrário.
+        """
+        if not self.__posicao_valida(linha, coluna):
+            return (False, None)
+        
+        # Verifica se já atirou nessa posicao
+        chave = (linha, coluna)
+        if chave in self.__tiros:
+            return (False, None)
+        
+        navio = self.__celulas.get(chave)
+        self.__tiros[chave] = navio is not None
+        if navio is None:
+            return (False, None)
+        
+        navio.receber_tiro(Posicao(linha, coluna))
+        if navio.esta_afundado():
+            self.__navios_ativos -= 1
+        return (True, navio)
+    
+    def receber_salva(self, tiros):
+        """
+        Recebe uma salva de tiros de uma vez.
+        
+        Args:
+            tiros (list): Coordenadas (linha, coluna) dos tiros, na ordem de disparo
+        
+        Returns:
+            list: Uma tupla (bool, Navio, bool) por tiro - se acertou, o navio
+                  atingido (ou None) e se esse tiro afundou o navio
+        """
+        tamanho = self.__tamanho
+        ja_atirados = self.__tiros
+        celulas = self.__celulas
+        
+        resultados = []
+        for linha, coluna in tiros:
+            chave = (linha, coluna)
+            if not (0 <= linha < tamanho and 0 <= coluna < tamanho) or chave in ja_atirados:
+                resultados.append((False, None, False))
+                continue
+            
+            navio = celulas.get(chave)
+            ja_atirados[chave] = navio is not None
+            if navio is None:
+                resultados.append((False, None, False))
+                continue
+            navio.receber_tiro(Posicao(linha, coluna))
+            afundou = navio.esta_afundado()
+            if afundou:
+                self.__navios_ativos -= 1
+            resultados.append((True, navio, afundou))
+        return resultados
+    
+    def todos_navios_afundados(self):
+        """
+        Verifica se todos os navios estão afundados.
+        
+        Returns:
+            bool: True se todos os navios estão afundados, False caso contrário
+        """
+        return self.__navios_ativos == 0
+    
+    def __posicao_valida(self, linha, coluna):
+        """
+        Verifica se uma posicao é válida no tabuleiro.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao é válida, False caso contrário
+        """
+        return 0 <= linha < self.__tamanho and 0 <= coluna < self.__tamanho
+    
+    def posicao_tem_tiro(self, linha, coluna):
+        """
+        Verifica se uma posicao já recebeu um tiro.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao já recebeu um tiro, False caso contrário
+        """
+        return (linha, coluna) in self.__tiros
+    
+    def posicao_tem_navio_atingido(self, linha, coluna):
+        """
+        Verifica se uma posicao tem um navio atingido.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao tem um navio atingido, False caso contrário
+        """
+        chave = (linha, coluna)
+        return chave in self.__tiros and chave in self.__celulas
+    
+    def posicao_tem_navio(self, linha, coluna):
+        """
+        Verifica se uma posicao tem um navio.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao tem um navio, False caso contrário
+        """
+        return (linha, coluna) in self.__celulas
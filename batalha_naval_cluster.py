@@ -0,0 +1,553 @@
+import asyncio
+import bisect
+import contextlib
+import hashlib
+import itertools
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from batalha_naval_servidor import ServidorSessoes, iniciar_servidor_tcp
+
+class AnelConsistente:
+    """
+    Anel de hashing consistente que associa chaves (ids de sessao) a nos.
+    
+    Cada no ocupa varios pontos virtuais no anel; uma chave pertence ao
+    primeiro ponto no sentido horario a partir do hash dela. Ao adicionar ou
+    remover um no, so as chaves entre ele e o ponto anterior mudam de dono.
+    """
+    
+    def __init__(self, nos=(), replicas=100):
+        """
+        Inicializa o anel.
+        
+        Args:
+            nos (iterable, optional): Nomes dos nos iniciais. Padrao eh nenhum.
+            replicas (int, optional): Pontos virtuais por no. Padrao eh 100.
+        """
+        self.__replicas = replicas
+        self.__hashes = []
+        self.__donos = []
+        self.__nos = set()
+        for no in nos:
+            self.adicionar(no)
+    
+    @property
+    def nos(self):
+        """Retorna os nomes dos nos do anel."""
+        return frozenset(self.__nos)
+    
+    def adicionar(self, no):
+        """
+        Adiciona um no ao anel.
+        
+        Args:
+            no (str): Nome do no
+        
+        Raises:
+            ValueError: Se o no ja esta no anel
+        """
+        if no in self.__nos:
+            raise ValueError(f"No ja esta no anel: {no}")
+        self.__nos.add(no)
+        for i in range(self.__replicas):
+            ponto = self.__posicao(f"{no}#{i}")
+            posicao = bisect.bisect(self.__hashes, ponto)
+            self.__hashes.insert(posicao, ponto)
+            self.__donos.insert(posicao, no)
+    
+    def remover(self, no):
+        """
+        Remove um no do anel.
+        
+        Args:
+            no (str): Nome do no
+        
+        Raises:
+            ValueError: Se o no nao esta no anel
+        """
+        if no not in self.__nos:
+            raise ValueError(f"No nao esta no anel: {no}")
+        self.__nos.remove(no)
+        pontos = [(ponto, dono) for ponto, dono in zip(self.__hashes, self.__donos) if dono != no]
+        self.__hashes = [ponto for ponto, _ in pontos]
+        self.__donos = [dono for _, dono in pontos]
+    
+    def no_para(self, chave):
+        """
+        Retorna o no responsavel por uma chave.
+        
+        Args:
+            chave (str): Chave (id da sessao)
+        
+        Returns:
+            str: Nome do no, ou None se o anel esta vazio
+        """
+        if not self.__hashes:
+            return None
+        posicao = bisect.bisect(self.__hashes, self.__posicao(chave)) % len(self.__hashes)
+        return self.__donos[posicao]
+    
+    def __posicao(self, texto):
+        """
+        Calcula a posicao de um texto no anel.
+        
+        Usa md5 em vez de hash() para que a posicao seja a mesma em todos
+        os processos, independente de PYTHONHASHSEED.
+        
+        Args:
+            texto (str): Texto a posicionar
+        
+        Returns:
+            int: Posicao no anel
+        """
+        return int.from_bytes(hashlib.md5(texto.encode()).digest()[:8], 'big')
+
+def _servir_trabalhador(conexao, tamanho, esparso):
+    """
+    Laco principal de um processo trabalhador.
+    
+    Hospeda um ServidorSessoes e atende as mensagens (tipo, dados) recebidas
+    pelo pipe, respondendo a cada uma com (True, resultado), ate receber
+    'parar'. Uma excecao no atendimento vira a resposta (False, mensagem),
+    para que um comando ruim nao derrube as outras sessoes do processo.
+    
+    Args:
+        conexao (multiprocessing.connection.Connection): Ponta do pipe do trabalhador
+        tamanho (int): Tamanho dos tabuleiros das sessoes
+        esparso (bool): Se True, as sessoes usam TabuleiroEsparso
+    """
+    servidor = ServidorSessoes(tamanho, esparso)
+    while True:
+        tipo, dados = conexao.recv()
+        if tipo == 'parar':
+            conexao.send((True, None))
+            break
+        try:
+            conexao.send((True, _atender_mensagem(servidor, tipo, dados)))
+        except Exception as e:
+            conexao.send((False, f"{type(e).__name__}: {e}"))
+    conexao.close()
+
+def _atender_mensagem(servidor, tipo, dados):
+    """
+    Atende uma mensagem recebida por um processo trabalhador.
+    
+    Args:
+        servidor (ServidorSessoes): Servidor do trabalhador
+        tipo (str): Tipo da mensagem
+        dados: Dados da mensagem
+    
+    Returns:
+        Resultado da mensagem
+    
+    Raises:
+        ValueError: Se o tipo da mensagem for desconhecido
+    """
+    if tipo == 'comando':
+        return servidor.executar(dados)
+    elif tipo == 'copiar':
+        # dados eh a lista de ids; None copia todas as sessoes. As sessoes
+        # continuam no servidor ate o destino confirmar a importacao
+        ids = list(servidor.sessoes) if dados is None else [id_sessao for id_sessao in dados if id_sessao in servidor.sessoes]
+        return [servidor.sessoes[id_sessao].para_dict() for id_sessao in ids]
+    elif tipo == 'importar':
+        # Um snapshot invalido ou repetido nao impede a importacao dos demais;
+        # a resposta sao os ids dos recusados
+        recusadas = []
+        for snapshot in dados:
+            try:
+                servidor.importar_sessao(snapshot)
+            except Exception:
+                recusadas.append(snapshot.get('id') if isinstance(snapshot, dict) else None)
+        return recusadas
+    elif tipo == 'descartar':
+        for id_sessao in dados:
+            servidor.sessoes.pop(id_sessao, None)
+        return None
+    elif tipo == 'sessoes':
+        return list(servidor.sessoes)
+    raise ValueError(f"Mensagem desconhecida: {tipo}")
+
+class _Trabalhador:
+    """Processo trabalhador e o pipe usado para falar com ele."""
+    
+    def __init__(self, nome, contexto, tamanho, esparso):
+        """
+        Inicia o processo trabalhador.
+        
+        Args:
+            nome (str): Nome do trabalhador no anel
+            contexto (multiprocessing.context.BaseContext): Contexto de multiprocessing
+            tamanho (int): Tamanho dos tabuleiros das sessoes
+            esparso (bool): Se True, as sessoes usam TabuleiroEsparso
+        """
+        self.nome = nome
+        self.conexao, ponta = contexto.Pipe()
+        self.processo = contexto.Process(target=_servir_trabalhador, args=(ponta, tamanho, esparso),
+                                         name=f"batalha-naval-{nome}", daemon=True)
+        self.processo.start()
+        ponta.close()
+        # Um pedido de cada vez por pipe
+        self.trava = threading.Lock()
+    
+    def pedir(self, tipo, dados=None):
+        """
+        Envia uma mensagem e espera a resposta; chamar com a trava adquirida.
+        
+        Args:
+            tipo (str): Tipo da mensagem
+            dados (optional): Dados da mensagem. Padrao eh None.
+        
+        Returns:
+            Resposta do trabalhador
+        
+        Raises:
+            EOFError: Se o processo trabalhador morreu
+            RuntimeError: Se o trabalhador falhou ao atender a mensagem
+        """
+        try:
+            self.conexao.send((tipo, dados))
+            ok, resultado = self.conexao.recv()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise EOFError(str(e))
+        if not ok:
+            raise RuntimeError(resultado)
+        return resultado
+    
+    def parar(self):
+        """Pede ao processo para terminar e espera por ele; chamar com a trava adquirida."""
+        try:
+            self.pedir('parar')
+        except EOFError:
+            pass
+        self.processo.join(5)
+        if self.processo.is_alive():
+            self.processo.terminate()
+            self.processo.join()
+        self.conexao.close()
+
+class ClusterSessoes:
+    """
+    Distribui sessoes de jogo entre varios processos trabalhadores.
+    
+    Cada trabalhador eh um processo com o seu proprio ServidorSessoes, entao
+    sessoes em trabalhadores diferentes rodam em paralelo, cada uma em um
+    interpretador com a sua propria GIL. O id da sessao escolhe o trabalhador
+    por um AnelConsistente. Quando um trabalhador entra, sai ou eh reiniciado,
+    as sessoes que mudam de dono sao migradas com o jogo em andamento, por
+    snapshot (SessaoJogo.para_dict()).
+    
+    Tem o mesmo metodo executar() do ServidorSessoes, entao pode ser exposto
+    por iniciar_servidor_tcp() e usado pelo teste de carga. executar() pode
+    ser chamado de varias threads ao mesmo tempo. Um trabalhador cujo processo
+    morreu eh reiniciado no proximo comando que chega a ele, sem as sessoes
+    que tinha.
+    """
+    
+    def __init__(self, trabalhadores=None, tamanho=10, esparso=False, replicas=100):
+        """
+        Inicia os processos trabalhadores.
+        
+        Args:
+            trabalhadores (int, optional): Quantidade de processos. Padrao eh None (um por CPU).
+            tamanho (int, optional): Tamanho dos tabuleiros das sessoes. Padrao eh 10.
+            esparso (bool, optional): Se True, as sessoes usam TabuleiroEsparso. Padrao eh False.
+            replicas (int, optional): Pontos virtuais por trabalhador no anel. Padrao eh 100.
+        
+        Raises:
+            ValueError: Se a quantidade de trabalhadores for menor que 1
+        """
+        if trabalhadores is None:
+            trabalhadores = multiprocessing.cpu_count()
+        if trabalhadores < 1:
+            raise ValueError("O cluster precisa de pelo menos um trabalhador.")
+        
+        # spawn funciona igual em todas as plataformas e nao herda threads do processo pai
+        self.__contexto = multiprocessing.get_context('spawn')
+        self.__tamanho = tamanho
+        self.__esparso = esparso
+        self.__contador_sessoes = itertools.count(1)
+        self.__contador_trabalhadores = itertools.count(1)
+        self.__trava_ids = threading.Lock()
+        self.__anel = AnelConsistente(replicas=replicas)
+        self.__trabalhadores = {}
+        for _ in range(trabalhadores):
+            trabalhador = self.__novo_trabalhador()
+            self.__trabalhadores[trabalhador.nome] = trabalhador
+            self.__anel.adicionar(trabalhador.nome)
+    
+    @property
+    def trabalhadores(self):
+        """Retorna os nomes dos trabalhadores ativos."""
+        return sorted(self.__trabalhadores)
+    
+    def trabalhador_da_sessao(self, id_sessao):
+        """
+        Retorna o trabalhador responsavel por uma sessao.
+        
+        Args:
+            id_sessao (str): Identificador da sessao
+        
+        Returns:
+            str: Nome do trabalhador
+        """
+        return self.__anel.no_para(id_sessao)
+    
+    def sessoes(self):
+        """
+        Lista as sessoes ativas de cada trabalhador.
+        
+        Returns:
+            dict: Ids das sessoes por nome do trabalhador
+        """
+        with self.__todas_as_travas():
+            return {nome: trabalhador.pedir('sessoes') for nome, trabalhador in self.__trabalhadores.items()}
+    
+    def executar(self, comando):
+        """
+        Encaminha um comando de cliente ao trabalhador dono da sessao.
+        
+        Args:
+            comando (dict): Comando com a 'acao' e os seus argumentos
+        
+        Returns:
+            dict: Resposta do comando
+        """
+        if not isinstance(comando, dict):
+            return {'ok': False, 'erro': "Comando invalido."}
+        if comando.get('acao') == 'criar' and comando.get('sessao') is None:
+            with self.__trava_ids:
+                comando = dict(comando, sessao=f"s{next(self.__contador_sessoes)}")
+        id_sessao = comando.get('sessao')
+        # O anel e a migracao usam o id como texto
+        if not isinstance(id_sessao, str):
+            return {'ok': False, 'erro': f"Id de sessao invalido: {id_sessao}"}
+        
+        while True:
+            trabalhador = self.__trabalhadores.get(self.__anel.no_para(id_sessao))
+            if trabalhador is None:
+                return {'ok': False, 'erro': "Nenhum trabalhador disponivel."}
+            with trabalhador.trava:
+                # A sessao pode ter migrado enquanto esperavamos pela trava
+                if self.__trabalhadores.get(self.__anel.no_para(id_sessao)) is not trabalhador:
+                    continue
+                try:
+                    return trabalhador.pedir('comando', comando)
+                except RuntimeError as e:
+                    return {'ok': False, 'erro': str(e)}
+                except EOFError:
+                    pass
+            # O processo morreu: troca por um novo para nao mandar mais comandos a ele
+            try:
+                self.__trocar_processo(trabalhador)
+            except (EOFError, RuntimeError) as e:
+                return {'ok': False, 'erro': f"Trabalhador fora do ar e nao reiniciado: {trabalhador.nome} ({e})"}
+            return {'ok': False, 'erro': f"Trabalhador fora do ar e reiniciado sem as sessoes: {trabalhador.nome}"}
+    
+    def adicionar_trabalhador(self):
+        """
+        Inicia mais um trabalhador e migra para ele as sessoes que passam a ser dele.
+        
+        Returns:
+            str: Nome do novo trabalhador
+        
+        Raises:
+            RuntimeError: Se alguma sessao nao pode ser migrada; nesse caso as
+                sessoes voltam para os trabalhadores de antes e o novo eh encerrado
+        """
+        trabalhador = self.__novo_trabalhador()
+        with self.__todas_as_travas(), trabalhador.trava:
+            self.__trabalhadores[trabalhador.nome] = trabalhador
+            self.__anel.adicionar(trabalhador.nome)
+            nao_migradas = self.__rebalancear([nome for nome in self.__trabalhadores if nome != trabalhador.nome])
+            if nao_migradas:
+                # Desfaz a entrada: as sessoes ja migradas voltam para os donos anteriores
+                self.__anel.remover(trabalhador.nome)
+                self.__rebalancear([trabalhador.nome])
+                self.__trabalhadores.pop(trabalhador.nome).parar()
+                raise RuntimeError(f"Sessoes que nao puderam ser migradas: {nao_migradas}")
+        return trabalhador.nome
+    
+    def remover_trabalhador(self, nome):
+        """
+        Migra as sessoes de um trabalhador para os demais e encerra o processo dele.
+        
+        Args:
+            nome (str): Nome do trabalhador
+        
+        Raises:
+            ValueError: Se o trabalhador nao existe ou eh o ultimo
+            RuntimeError: Se alguma sessao nao pode ser migrada; nesse caso o
+                trabalhador continua no anel, com as sessoes de antes
+        """
+        if nome not in self.__trabalhadores:
+            raise ValueError(f"Trabalhador desconhecido: {nome}")
+        with self.__todas_as_travas():
+            if len(self.__trabalhadores) == 1:
+                raise ValueError("Nao eh possivel remover o ultimo trabalhador.")
+            self.__anel.remover(nome)
+            nao_migradas = self.__rebalancear([nome])
+            if nao_migradas:
+                # Desfaz a saida: as sessoes ja migradas voltam para o trabalhador
+                self.__anel.adicionar(nome)
+                self.__rebalancear([outro for outro in self.__trabalhadores if outro != nome])
+                raise RuntimeError(f"Sessoes que nao puderam ser migradas: {nao_migradas}")
+            self.__trabalhadores.pop(nome).parar()
+    
+    def reiniciar_trabalhador(self, nome):
+        """
+        Troca o processo de um trabalhador por um novo, com as mesmas sessoes.
+        
+        As sessoes sao exportadas do processo antigo e importadas no novo, que
+        assume o mesmo lugar no anel. Se o processo antigo ja morreu, as sessoes
+        dele se perdem e o novo comeca vazio.
+        
+        Args:
+            nome (str): Nome do trabalhador
+        
+        Returns:
+            int: Quantidade de sessoes migradas
+        
+        Raises:
+            ValueError: Se o trabalhador nao existe
+            RuntimeError: Se o novo processo recusou alguma sessao; nesse caso
+                o processo antigo continua no lugar, com todas as sessoes
+            EOFError: Se o novo processo morreu durante a migracao
+        """
+        trabalhador = self.__trabalhadores.get(nome)
+        if trabalhador is None:
+            raise ValueError(f"Trabalhador desconhecido: {nome}")
+        return self.__trocar_processo(trabalhador) or 0
+    
+    def encerrar(self):
+        """Encerra todos os processos trabalhadores; as sessoes ativas se perdem."""
+        with self.__todas_as_travas():
+            for trabalhador in self.__trabalhadores.values():
+                trabalhador.parar()
+                self.__anel.remover(trabalhador.nome)
+            self.__trabalhadores.clear()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, tipo, valor, rastreamento):
+        self.encerrar()
+    
+    def __novo_trabalhador(self, nome=None):
+        """
+        Inicia um processo trabalhador.
+        
+        Args:
+            nome (str, optional): Nome do trabalhador. Padrao eh None (gera um nome novo).
+        
+        Returns:
+            _Trabalhador: Trabalhador iniciado
+        """
+        if nome is None:
+            nome = f"t{next(self.__contador_trabalhadores)}"
+        return _Trabalhador(nome, self.__contexto, self.__tamanho, self.__esparso)
+    
+    def __trocar_processo(self, antigo):
+        """
+        Troca o processo de um trabalhador por um novo, migrando as sessoes.
+        
+        Args:
+            antigo (_Trabalhador): Trabalhador a substituir
+        
+        As sessoes sao copiadas do processo antigo e so deixam de existir nele
+        quando ele eh parado, depois que o novo importou todas; se qualquer
+        passo falhar, o novo eh parado e o antigo continua no lugar.
+        
+        Args:
+            antigo (_Trabalhador): Trabalhador a substituir
+        
+        Returns:
+            int: Sessoes migradas, ou None se outro pedido ja substituiu o trabalhador
+        
+        Raises:
+            RuntimeError: Se o novo processo recusou alguma sessao
+            EOFError: Se o novo processo morreu durante a migracao
+        """
+        # Inicia o substituto antes de parar o cluster, pois subir um processo eh lento
+        novo = self.__novo_trabalhador(antigo.nome)
+        with self.__todas_as_travas(), novo.trava:
+            try:
+                if self.__trabalhadores.get(antigo.nome) is not antigo:
+                    novo.parar()
+                    return None
+                try:
+                    snapshots = antigo.pedir('copiar')
+                except EOFError:
+                    snapshots = []
+                recusadas = novo.pedir('importar', snapshots)
+                if recusadas:
+                    raise RuntimeError(f"Sessoes recusadas pelo novo processo: {recusadas}")
+            except BaseException:
+                novo.parar()
+                raise
+            self.__trabalhadores[antigo.nome] = novo
+            antigo.parar()
+        return len(snapshots)
+    
+    def __rebalancear(self, origens):
+        """
+        Move para o dono atual no anel as sessoes que estao no trabalhador errado.
+        
+        Chamar com todas as travas adquiridas e o anel ja atualizado. As
+        sessoes sao copiadas da origem e so sao descartadas nela depois que o
+        destino confirma a importacao; as que o destino recusa (invalidas ou
+        repetidas) ou que iam para um processo morto continuam na origem.
+        
+        Args:
+            origens (list): Nomes dos trabalhadores que podem ter sessoes fora do lugar
+        
+        Returns:
+            list: Ids das sessoes que continuaram na origem
+        """
+        nao_migradas = []
+        for origem in origens:
+            trabalhador = self.__trabalhadores[origem]
+            try:
+                ids = [id_sessao for id_sessao in trabalhador.pedir('sessoes')
+                       if self.__anel.no_para(id_sessao) != origem]
+                snapshots = trabalhador.pedir('copiar', ids) if ids else []
+            except EOFError:
+                # Processo morto: sera reiniciado no proximo comando que chegar a ele
+                continue
+            destinos = {}
+            for snapshot in snapshots:
+                destinos.setdefault(self.__anel.no_para(snapshot['id']), []).append(snapshot)
+            migradas = []
+            for destino, snapshots_destino in destinos.items():
+                try:
+                    recusadas = set(self.__trabalhadores[destino].pedir('importar', snapshots_destino))
+                except EOFError:
+                    recusadas = {snapshot['id'] for snapshot in snapshots_destino}
+                for snapshot in snapshots_destino:
+                    (nao_migradas if snapshot['id'] in recusadas else migradas).append(snapshot['id'])
+            if migradas:
+                try:
+                    trabalhador.pedir('descartar', migradas)
+                except EOFError:
+                    pass
+        return nao_migradas
+    
+    @contextlib.contextmanager
+    def __todas_as_travas(self):
+        """Adquire as travas de todos os trabalhadores, sempre na mesma ordem."""
+        with contextlib.ExitStack() as pilha:
+            for nome in sorted(self.__trabalhadores):
+                pilha.enter_context(self.__trabalhadores[nome].trava)
+            yield
+
+# Executa o cluster de sessoes em localhost
+if __name__ == "__main__":
+    async def principal():
+        with ClusterSessoes() as cluster, ThreadPoolExecutor(max_workers=4 * len(cluster.trabalhadores)) as executor:
+            servidor_tcp = await iniciar_servidor_tcp(cluster, '127.0.0.1', 8765, executor)
+            print(f"Cluster de sessoes em 127.0.0.1:8765 com {len(cluster.trabalhadores)} trabalhadores")
+            async with servidor_tcp:
+                await servidor_tcp.serve_forever()
+    
+    asyncio.run(principal())
@@ -0,0 +1,436 @@
+import copy
+import random
+import time
+from batalha_naval_estrategias import VisaoTabuleiro
+from batalha_naval_replay import mascaras_navios
+
+# Chaves de Zobrist por tamanho de tabuleiro, geradas uma unica vez
+_CHAVES_ZOBRIST = {}
+
+def _chaves_zobrist(tamanho):
+    """
+    Retorna as chaves de Zobrist de um tamanho de tabuleiro, uma por celula.
+    
+    As chaves saem de um gerador com semente fixa, entao sao as mesmas em
+    todos os processos e os hashes podem ser comparados entre eles.
+    
+    Args:
+        tamanho (int): Tamanho do tabuleiro
+    
+    Returns:
+        tuple: Um inteiro aleatorio de 64 bits por celula
+    """
+    chaves = _CHAVES_ZOBRIST.get(tamanho)
+    if chaves is None:
+        gerador = random.Random(tamanho)
+        chaves = _CHAVES_ZOBRIST[tamanho] = tuple(gerador.getrandbits(64) for _ in range(tamanho * tamanho))
+    return chaves
+
+class Frota:
+    """
+    Posicionamento imutavel de uma frota, em bitmasks.
+    
+    Eh a parte grande de um estado de tabuleiro e nunca muda durante a
+    partida, entao todos os estados derivados compartilham o mesmo objeto.
+    """
+    
+    __slots__ = ('__tamanho', '__mascaras', '__ocupacao', '__navio_por_celula', '__chaves', '__hash')
+    
+    def __init__(self, tamanho, mascaras):
+        """
+        Inicializa a frota.
+        
+        Args:
+            tamanho (int): Tamanho do tabuleiro
+            mascaras (iterable): Uma bitmask por navio (indice do bit = linha * tamanho + coluna)
+        
+        Raises:
+            ValueError: Se dois navios ocupam a mesma celula ou algum sai do tabuleiro
+        """
+        self.__tamanho = tamanho
+        self.__mascaras = tuple(mascaras)
+        self.__navio_por_celula = {}
+        ocupacao = 0
+        for navio, mascara in enumerate(self.__mascaras):
+            if ocupacao & mascara:
+                raise ValueError("Dois navios ocupam a mesma celula.")
+            if mascara >> (tamanho * tamanho):
+                raise ValueError("Navio fora do tabuleiro.")
+            ocupacao |= mascara
+            while mascara:
+                bit = mascara & -mascara
+                self.__navio_por_celula[bit.bit_length() - 1] = navio
+                mascara ^= bit
+        self.__ocupacao = ocupacao
+        self.__chaves = _chaves_zobrist(tamanho)
+        self.__hash = hash((tamanho, self.__mascaras))
+    
+    @classmethod
+    def de_tabuleiro(cls, tabuleiro):
+        """
+        Cria a frota a partir dos navios de um Tabuleiro ou TabuleiroEsparso.
+        
+        Args:
+            tabuleiro (Tabuleiro): Tabuleiro com os navios posicionados
+        
+        Returns:
+            Frota: Frota com os mesmos navios, na mesma ordem
+        """
+        tamanho = tabuleiro.tamanho
+        mascaras = []
+        for navio in tabuleiro.navios:
+            mascara = 0
+            for linha, coluna in navio.celulas():
+                mascara |= 1 << (linha * tamanho + coluna)
+            mascaras.append(mascara)
+        return cls(tamanho, mascaras)
+    
+    @classmethod
+    def de_navios(cls, tamanho, navios):
+        """
+        Cria a frota a partir de navios (tamanho, linha, coluna, orientacao), como na GravacaoPartida.
+        
+        Args:
+            tamanho (int): Tamanho do tabuleiro
+            navios (list): Navios do tabuleiro
+        
+        Returns:
+            Frota: Frota com os navios informados
+        """
+        return cls(tamanho, mascaras_navios(tamanho, navios))
+    
+    @property
+    def tamanho(self):
+        """Retorna o tamanho do tabuleiro."""
+        return self.__tamanho
+    
+    @property
+    def mascaras(self):
+        """Retorna a bitmask de cada navio."""
+        return self.__mascaras
+    
+    @property
+    def ocupacao(self):
+        """Retorna a bitmask de todas as celulas ocupadas."""
+        return self.__ocupacao
+    
+    @property
+    def chaves(self):
+        """Retorna as chaves de Zobrist das celulas."""
+        return self.__chaves
+    
+    def navio_na_celula(self, indice):
+        """
+        Retorna o navio que ocupa uma celula.
+        
+        Args:
+            indice (int): Indice da celula (linha * tamanho + coluna)
+        
+        Returns:
+            int: Indice do navio em mascaras, ou None se a celula esta vazia
+        """
+        return self.__navio_por_celula.get(indice)
+    
+    def __eq__(self, other):
+        """Duas frotas sao iguais se tem o mesmo tamanho e os mesmos navios, na mesma ordem."""
+        if not isinstance(other, Frota):
+            return NotImplemented
+        return self is other or (self.__tamanho == other.__tamanho and self.__mascaras == other.__mascaras)
+    
+    def __hash__(self):
+        """Retorna o hash da frota, calculado na criacao."""
+        return self.__hash
+
+class EstadoTabuleiro:
+    """
+    Estado imutavel de um tabuleiro: a frota e os tiros recebidos.
+    
+    Atirar devolve um novo estado que compartilha a Frota com o anterior;
+    so os tiros, as celulas afundadas e o hash sao novos, todos inteiros.
+    O hash eh de Zobrist, atualizado com um XOR por tiro, entao estados
+    servem de chave de tabela de transposicao sem custo extra.
+    
+    O estado tem os mesmos atributos de um RegistroTiros (tiros, acertos,
+    afundados, frota_restante), entao uma VisaoTabuleiro sobre ele entrega
+    as estrategias apenas o que o atirador pode ver.
+    """
+    
+    __slots__ = ('__frota', '__tiros', '__afundados', '__hash')
+    
+    def __init__(self, frota, tiros=0):
+        """
+        Inicializa o estado.
+        
+        Args:
+            frota (Frota): Frota do tabuleiro
+            tiros (int, optional): Bitmask das celulas que ja receberam tiro. Padrao eh 0.
+        """
+        self.__frota = frota
+        self.__tiros = tiros
+        self.__afundados = 0
+        for mascara in frota.mascaras:
+            if tiros & mascara == mascara:
+                self.__afundados |= mascara
+        
+        chaves = frota.chaves
+        valor = hash(frota)
+        while tiros:
+            bit = tiros & -tiros
+            valor ^= chaves[bit.bit_length() - 1]
+            tiros ^= bit
+        self.__hash = valor
+    
+    @classmethod
+    def de_tabuleiro(cls, tabuleiro):
+        """
+        Cria o estado atual de um Tabuleiro ou TabuleiroEsparso, com os tiros ja recebidos.
+        
+        Args:
+            tabuleiro (Tabuleiro): Tabuleiro de origem
+        
+        Returns:
+            EstadoTabuleiro: Estado equivalente ao tabuleiro
+        """
+        tiros = 0
+        for posicao in tabuleiro.tiros:
+            tiros |= 1 << (posicao.linha * tabuleiro.tamanho + posicao.coluna)
+        return cls(Frota.de_tabuleiro(tabuleiro), tiros)
+    
+    @property
+    def frota(self):
+        """Retorna a frota, compartilhada com os outros estados da partida."""
+        return self.__frota
+    
+    @property
+    def tamanho(self):
+        """Retorna o tamanho do tabuleiro."""
+        return self.__frota.tamanho
+    
+    @property
+    def tiros(self):
+        """Retorna a bitmask das celulas que ja receberam tiro."""
+        return self.__tiros
+    
+    @property
+    def acertos(self):
+        """Retorna a bitmask das celulas onde um navio foi atingido."""
+        return self.__tiros & self.__frota.ocupacao
+    
+    @property
+    def afundados(self):
+        """Retorna a bitmask das celulas de navios afundados."""
+        return self.__afundados
+    
+    @property
+    def frota_restante(self):
+        """Retorna os tamanhos dos navios ainda nao afundados, do maior para o menor."""
+        afundados = self.__afundados
+        return tuple(sorted((bin(mascara).count('1') for mascara in self.__frota.mascaras
+                             if not afundados & mascara), reverse=True))
+    
+    @property
+    def visao(self):
+        """Retorna uma visao do estado com o que o atirador pode ver."""
+        return VisaoTabuleiro(self)
+    
+    def atirar(self, linha, coluna):
+        """
+        Aplica um tiro e retorna o novo estado, sem alterar este.
+        
+        Args:
+            linha (int): Linha do tiro
+            coluna (int): Coluna do tiro
+        
+        Returns:
+            tuple: (EstadoTabuleiro, bool, int) - Novo estado, se acertou um navio e o
+                   indice do navio afundado pelo tiro, ou None
+        
+        Raises:
+            ValueError: Se a posicao esta fora do tabuleiro ou ja recebeu tiro
+        """
+        frota = self.__frota
+        tamanho = frota.tamanho
+        if not (0 <= linha < tamanho and 0 <= coluna < tamanho):
+            raise ValueError(f"Coordenadas fora do tabuleiro. Use valores entre 0 e {tamanho - 1}.")
+        indice = linha * tamanho + coluna
+        bit = 1 << indice
+        if self.__tiros & bit:
+            raise ValueError("Essa posicao ja recebeu um tiro.")
+        
+        # O novo estado so recebe inteiros novos; a frota eh compartilhada
+        classe = type(self)
+        novo = classe.__new__(classe)
+        tiros = self.__tiros | bit
+        novo.__frota = frota
+        novo.__tiros = tiros
+        novo.__afundados = self.__afundados
+        novo.__hash = self.__hash ^ frota.chaves[indice]
+        
+        navio = frota.navio_na_celula(indice)
+        if navio is None:
+            return novo, False, None
+        mascara = frota.mascaras[navio]
+        if tiros & mascara == mascara:
+            novo.__afundados |= mascara
+            return novo, True, navio
+        return novo, True, None
+    
+    def todos_navios_afundados(self):
+        """
+        Verifica se todos os navios estao afundados.
+        
+        Returns:
+            bool: True se todos os navios estao afundados, False caso contrario
+        """
+        return self.__afundados == self.__frota.ocupacao
+    
+    def celulas_livres(self):
+        """
+        Percorre as celulas que ainda nao receberam tiro.
+        
+        Yields:
+            tuple: (int, int) - Coordenadas (linha, coluna) de cada celula livre
+        """
+        tamanho = self.__frota.tamanho
+        livres = ~self.__tiros & ((1 << tamanho * tamanho) - 1)
+        while livres:
+            bit = livres & -livres
+            yield divmod(bit.bit_length() - 1, tamanho)
+            livres ^= bit
+    
+    def __eq__(self, other):
+        """Dois estados sao iguais se tem a mesma frota e os mesmos tiros."""
+        if not isinstance(other, EstadoTabuleiro):
+            return NotImplemented
+        return (self.__hash == other.__hash and self.__tiros == other.__tiros and
+                self.__frota == other.__frota)
+    
+    def __hash__(self):
+        """Retorna o hash de Zobrist do estado."""
+        return self.__hash
+
+class EstadoJogo:
+    """
+    Estado imutavel de uma partida: os dois tabuleiros e de quem eh a vez.
+    
+    O tabuleiro de indice i eh o do jogador i, que recebe os tiros do outro
+    jogador, como na GravacaoPartida. Cada tiro troca a vez.
+    """
+    
+    __slots__ = ('__tabuleiros', '__vez', '__hash')
+    
+    def __init__(self, tabuleiro_0, tabuleiro_1, vez=0):
+        """
+        Inicializa o estado.
+        
+        Args:
+            tabuleiro_0 (EstadoTabuleiro): Tabuleiro do jogador 0
+            tabuleiro_1 (EstadoTabuleiro): Tabuleiro do jogador 1
+            vez (int, optional): Indice do jogador que atira agora. Padrao eh 0.
+        """
+        self.__tabuleiros = (tabuleiro_0, tabuleiro_1)
+        self.__vez = vez
+        self.__hash = hash((hash(tabuleiro_0), hash(tabuleiro_1), vez))
+    
+    @classmethod
+    def de_gravacao(cls, gravacao, turno=None):
+        """
+        Recria o estado de uma partida gravada, com um tiro por turno.
+        
+        Args:
+            gravacao (GravacaoPartida): Partida gravada
+            turno (int, optional): Quantidade de tiros a aplicar. Padrao eh a partida inteira.
+        
+        Returns:
+            EstadoJogo: Estado depois dos tiros aplicados
+        """
+        tamanho = gravacao.tamanho
+        tiros = [0, 0]
+        tiros_aplicados = gravacao.tiros if turno is None else gravacao.tiros[:turno]
+        for atirador, linha, coluna in tiros_aplicados:
+            tiros[1 - atirador] |= 1 << (linha * tamanho + coluna)
+        tabuleiros = [EstadoTabuleiro(Frota.de_navios(tamanho, navios), tiros[jogador])
+                      for jogador, navios in enumerate(gravacao.navios)]
+        vez = 1 - tiros_aplicados[-1][0] if tiros_aplicados else 0
+        return cls(tabuleiros[0], tabuleiros[1], vez)
+    
+    @property
+    def tabuleiros(self):
+        """Retorna os estados dos tabuleiros dos jogadores 0 e 1."""
+        return self.__tabuleiros
+    
+    @property
+    def vez(self):
+        """Retorna o indice do jogador que atira agora."""
+        return self.__vez
+    
+    @property
+    def vencedor(self):
+        """Retorna o indice do vencedor, ou None se a partida nao terminou."""
+        for jogador, tabuleiro in enumerate(self.__tabuleiros):
+            if tabuleiro.todos_navios_afundados():
+                return 1 - jogador
+        return None
+    
+    def atirar(self, linha, coluna):
+        """
+        Aplica o tiro do jogador da vez e retorna o novo estado, com a vez trocada.
+        
+        Args:
+            linha (int): Linha do tiro
+            coluna (int): Coluna do tiro
+        
+        Returns:
+            tuple: (EstadoJogo, bool, int) - Novo estado, se acertou um navio e o
+                   indice do navio afundado pelo tiro, ou None
+        
+        Raises:
+            ValueError: Se a partida terminou ou o tiro eh invalido
+        """
+        if self.vencedor is not None:
+            raise ValueError("A partida ja terminou.")
+        alvo = 1 - self.__vez
+        tabuleiro, acertou, navio_afundado = self.__tabuleiros[alvo].atirar(linha, coluna)
+        tabuleiros = (self.__tabuleiros[0], tabuleiro) if alvo == 1 else (tabuleiro, self.__tabuleiros[1])
+        return EstadoJogo(tabuleiros[0], tabuleiros[1], alvo), acertou, navio_afundado
+    
+    def __eq__(self, other):
+        """Dois estados sao iguais se tem os mesmos tabuleiros e a mesma vez."""
+        if not isinstance(other, EstadoJogo):
+            return NotImplemented
+        return (self.__hash == other.__hash and self.__vez == other.__vez and
+                self.__tabuleiros == other.__tabuleiros)
+    
+    def __hash__(self):
+        """Retorna o hash do estado, calculado na criacao."""
+        return self.__hash
+
+# Compara o custo de derivar estados com o de copiar um Tabuleiro
+if __name__ == "__main__":
+    from batalha_naval_classes import Tabuleiro, criar_frota_padrao, posicionar_frota_aleatoria
+    
+    tabuleiro = Tabuleiro()
+    posicionar_frota_aleatoria(tabuleiro, criar_frota_padrao())
+    inicial = EstadoTabuleiro.de_tabuleiro(tabuleiro)
+    celulas = list(inicial.celulas_livres())
+    
+    inicio = time.perf_counter()
+    for _ in range(200):
+        copia = copy.deepcopy(tabuleiro)
+        for linha, coluna in random.sample(celulas, 50):
+            copia = copy.deepcopy(copia)
+            copia.receber_tiro(linha, coluna)
+    por_copia = (time.perf_counter() - inicio) / (200 * 50)
+    
+    transposicao = {}
+    inicio = time.perf_counter()
+    for _ in range(20000):
+        estado = inicial
+        for linha, coluna in random.sample(celulas, 50):
+            estado = estado.atirar(linha, coluna)[0]
+            transposicao[estado] = transposicao.get(estado, 0) + 1
+    por_estado = (time.perf_counter() - inicio) / (20000 * 50)
+    
+    print(f"Tabuleiro copiado: {por_copia * 1e6:.1f} us por no")
+    print(f"EstadoTabuleiro: {por_estado * 1e6:.2f} us por no, com tabela de transposicao "
+          f"({len(transposicao)} estados distintos)")
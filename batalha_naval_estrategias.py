@@ -0,0 +1,1031 @@
+from abc import ABC, abstractmethod
+from collections import deque
+import random
+
+AREA_MAXIMA_BITMASK = 4096  # acima disso criar_registro_tiros usa o RegistroTirosEsparso
+
+class RegistroTiros:
+    """
+    Registro compacto dos tiros feitos contra o oponente.
+    
+    Tiros, acertos e celulas de navios afundados sao guardados como bitmasks
+    (um bit por celula, indice = linha * tamanho + coluna), junto com os
+    tamanhos dos navios que ainda nao foram afundados.
+    """
+    
+    def __init__(self, tamanho=10, frota=(5, 4, 3, 2, 1)):
+        """
+        Inicializa um registro vazio.
+        
+        Args:
+            tamanho (int, optional): Tamanho do tabuleiro do oponente. Padrao eh 10.
+            frota (tuple, optional): Tamanhos dos navios do oponente. Padrao eh a frota padrao.
+        """
+        self.__tamanho = tamanho
+        self.__tiros = 0
+        self.__acertos = 0
+        self.__afundados = 0
+        self.__frota_restante = sorted(frota, reverse=True)
+        self.__visao = VisaoTabuleiro(self)
+    
+    @property
+    def tamanho(self):
+        """Retorna o tamanho do tabuleiro do oponente."""
+        return self.__tamanho
+    
+    @property
+    def tiros(self):
+        """Retorna a bitmask das celulas que ja receberam tiro."""
+        return self.__tiros
+    
+    @property
+    def acertos(self):
+        """Retorna a bitmask das celulas onde um navio foi atingido."""
+        return self.__acertos
+    
+    @property
+    def afundados(self):
+        """Retorna a bitmask das celulas de navios afundados."""
+        return self.__afundados
+    
+    @property
+    def frota_restante(self):
+        """Retorna os tamanhos dos navios ainda nao afundados, do maior para o menor."""
+        return tuple(self.__frota_restante)
+    
+    @property
+    def visao(self):
+        """Retorna a visao somente leitura deste registro."""
+        return self.__visao
+    
+    def registrar(self, linha, coluna, acertou, navio_afundado=None):
+        """
+        Registra o resultado de um tiro.
+        
+        Args:
+            linha (int): Linha do tiro
+            coluna (int): Coluna do tiro
+            acertou (bool): True se acertou um navio, False caso contrario
+            navio_afundado (Navio, optional): Navio afundado pelo tiro, se houver. Padrao eh None.
+        """
+        bit = 1 << (linha * self.__tamanho + coluna)
+        self.__tiros |= bit
+        if acertou:
+            self.__acertos |= bit
+        
+        if navio_afundado is not None and navio_afundado.esta_afundado():
+            for linha_navio, coluna_navio in navio_afundado.celulas():
+                self.__afundados |= 1 << (linha_navio * self.__tamanho + coluna_navio)
+            if navio_afundado.tamanho in self.__frota_restante:
+                self.__frota_restante.remove(navio_afundado.tamanho)
+
+class RegistroTirosEsparso:
+    """
+    Registro dos tiros feitos contra o oponente, indicado para tabuleiros grandes.
+    
+    Guarda os indices das celulas em conjuntos, entao registrar e consultar
+    um tiro custa O(1) independente da area; no RegistroTiros cada operacao
+    na bitmask custa O(area / 64). As bitmasks tiros, acertos e afundados
+    continuam disponiveis, mas sao montadas a cada consulta.
+    """
+    
+    def __init__(self, tamanho=10, frota=(5, 4, 3, 2, 1)):
+        """
+        Inicializa um registro vazio.
+        
+        Args:
+            tamanho (int, optional): Tamanho do tabuleiro do oponente. Padrao eh 10.
+            frota (tuple, optional): Tamanhos dos navios do oponente. Padrao eh a frota padrao.
+        """
+        self.__tamanho = tamanho
+        self.__tiros = set()
+        self.__acertos = set()
+        self.__afundados = set()
+        self.__frota_restante = sorted(frota, reverse=True)
+        self.__visao = VisaoTabuleiroEsparsa(self)
+    
+    @property
+    def tamanho(self):
+        """Retorna o tamanho do tabuleiro do oponente."""
+        return self.__tamanho
+    
+    @property
+    def tiros(self):
+        """Retorna a bitmask das celulas que ja receberam tiro (montada na hora)."""
+        return self.__mascara(self.__tiros)
+    
+    @property
+    def acertos(self):
+        """Retorna a bitmask das celulas onde um navio foi atingido (montada na hora)."""
+        return self.__mascara(self.__acertos)
+    
+    @property
+    def afundados(self):
+        """Retorna a bitmask das celulas de navios afundados (montada na hora)."""
+        return self.__mascara(self.__afundados)
+    
+    @property
+    def indices_tiros(self):
+        """Retorna o conjunto dos indices que ja receberam tiro; nao deve ser alterado."""
+        return self.__tiros
+    
+    @property
+    def indices_acertos(self):
+        """Retorna o conjunto dos indices onde um navio foi atingido; nao deve ser alterado."""
+        return self.__acertos
+    
+    @property
+    def indices_afundados(self):
+        """Retorna o conjunto dos indices de navios afundados; nao deve ser alterado."""
+        return self.__afundados
+    
+    @property
+    def frota_restante(self):
+        """Retorna os tamanhos dos navios ainda nao afundados, do maior para o menor."""
+        return tuple(self.__frota_restante)
+    
+    @property
+    def visao(self):
+        """Retorna a visao somente leitura deste registro."""
+        return self.__visao
+    
+    def registrar(self, linha, coluna, acertou, navio_afundado=None):
+        """
+        Registra o resultado de um tiro.
+        
+        Args:
+            linha (int): Linha do tiro
+            coluna (int): Coluna do tiro
+            acertou (bool): True se acertou um navio, False caso contrario
+            navio_afundado (Navio, optional): Navio afundado pelo tiro, se houver. Padrao eh None.
+        """
+        indice = linha * self.__tamanho + coluna
+        self.__tiros.add(indice)
+        if acertou:
+            self.__acertos.add(indice)
+        
+        if navio_afundado is not None and navio_afundado.esta_afundado():
+            for linha_navio, coluna_navio in navio_afundado.celulas():
+                self.__afundados.add(linha_navio * self.__tamanho + coluna_navio)
+            if navio_afundado.tamanho in self.__frota_restante:
+                self.__frota_restante.remove(navio_afundado.tamanho)
+    
+    def __mascara(self, indices):
+        """
+        Monta a bitmask de um conjunto de indices.
+        
+        Args:
+            indices (set): Indices das celulas
+        
+        Returns:
+            int: Bitmask com um bit ligado por indice
+        """
+        bytes_mascara = bytearray((self.__tamanho * self.__tamanho + 7) // 8)
+        for indice in indices:
+            bytes_mascara[indice >> 3] |= 1 << (indice & 7)
+        return int.from_bytes(bytes_mascara, 'little')
+
+def criar_registro_tiros(tamanho=10, frota=(5, 4, 3, 2, 1), esparso=None):
+    """
+    Cria o registro de tiros adequado ao tamanho do tabuleiro.
+    
+    Args:
+        tamanho (int, optional): Tamanho do tabuleiro do oponente. Padrao eh 10.
+        frota (tuple, optional): Tamanhos dos navios do oponente. Padrao eh a frota padrao.
+        esparso (bool, optional): Se True, usa o RegistroTirosEsparso. Padrao eh None
+            (esparso quando a area passa de AREA_MAXIMA_BITMASK).
+    
+    Returns:
+        RegistroTiros | RegistroTirosEsparso: Registro vazio
+    """
+    if esparso is None:
+        esparso = tamanho * tamanho > AREA_MAXIMA_BITMASK
+    return RegistroTirosEsparso(tamanho, frota) if esparso else RegistroTiros(tamanho, frota)
+
+class VisaoTabuleiro:
+    """
+    Visao somente leitura e barata de consultar do tabuleiro do oponente.
+    
+    E o que as estrategias recebem para decidir a proxima jogada: nao copia
+    nenhum dado, apenas consulta o RegistroTiros de origem.
+    """
+    
+    def __init__(self, registro):
+        """
+        Inicializa a visao sobre um registro de tiros.
+        
+        Args:
+            registro (RegistroTiros): Registro consultado pela visao
+        """
+        self.__registro = registro
+    
+    @property
+    def tamanho(self):
+        """Retorna o tamanho do tabuleiro do oponente."""
+        return self.__registro.tamanho
+    
+    @property
+    def tiros(self):
+        """Retorna a bitmask das celulas que ja receberam tiro."""
+        return self.__registro.tiros
+    
+    @property
+    def acertos(self):
+        """Retorna a bitmask das celulas onde um navio foi atingido."""
+        return self.__registro.acertos
+    
+    @property
+    def afundados(self):
+        """Retorna a bitmask das celulas de navios afundados."""
+        return self.__registro.afundados
+    
+    @property
+    def frota_restante(self):
+        """Retorna os tamanhos dos navios ainda nao afundados, do maior para o menor."""
+        return self.__registro.frota_restante
+    
+    def indice(self, linha, coluna):
+        """
+        Converte coordenadas no indice do bit correspondente.
+        
+        Args:
+            linha (int): Linha da celula
+            coluna (int): Coluna da celula
+        
+        Returns:
+            int: Indice da celula nas bitmasks
+        """
+        return linha * self.__registro.tamanho + coluna
+    
+    def coordenadas(self, indice):
+        """
+        Converte o indice de um bit nas coordenadas da celula.
+        
+        Args:
+            indice (int): Indice da celula nas bitmasks
+        
+        Returns:
+            tuple: (int, int) - Coordenadas (linha, coluna)
+        """
+        return divmod(indice, self.__registro.tamanho)
+    
+    def posicao_valida(self, linha, coluna):
+        """
+        Verifica se uma posicao esta dentro do tabuleiro.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao eh valida, False caso contrario
+        """
+        tamanho = self.__registro.tamanho
+        return 0 <= linha < tamanho and 0 <= coluna < tamanho
+    
+    def tem_tiro(self, linha, coluna):
+        """
+        Verifica se uma posicao ja recebeu um tiro.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao ja recebeu um tiro, False caso contrario
+        """
+        return bool(self.__registro.tiros >> self.indice(linha, coluna) & 1)
+    
+    def tem_acerto(self, linha, coluna):
+        """
+        Verifica se um tiro nessa posicao atingiu um navio.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao tem um navio atingido, False caso contrario
+        """
+        return bool(self.__registro.acertos >> self.indice(linha, coluna) & 1)
+    
+    def tem_afundado(self, linha, coluna):
+        """
+        Verifica se a posicao pertence a um navio ja afundado.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao pertence a um navio afundado, False caso contrario
+        """
+        return bool(self.__registro.afundados >> self.indice(linha, coluna) & 1)
+    
+    def celula_livre(self, linha, coluna):
+        """
+        Verifica se uma posicao eh valida e ainda nao recebeu tiro.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se ainda eh possivel atirar na posicao, False caso contrario
+        """
+        return self.posicao_valida(linha, coluna) and not self.tem_tiro(linha, coluna)
+    
+    def posicao_tem_tiro(self, linha, coluna):
+        """
+        Verifica se uma posicao ja recebeu um tiro, como em Tabuleiro.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao ja recebeu um tiro, False caso contrario
+        """
+        return self.posicao_valida(linha, coluna) and self.tem_tiro(linha, coluna)
+    
+    def posicao_tem_navio_atingido(self, linha, coluna):
+        """
+        Verifica se um tiro nessa posicao atingiu um navio, como em Tabuleiro.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao tem um navio atingido, False caso contrario
+        """
+        return self.posicao_valida(linha, coluna) and self.tem_acerto(linha, coluna)
+    
+    def quantidade_tiros(self):
+        """
+        Conta as celulas que ja receberam tiro.
+        
+        Returns:
+            int: Quantidade de tiros
+        """
+        return bin(self.__registro.tiros).count('1')
+    
+    def acertos_ativos(self):
+        """
+        Lista os acertos em navios que ainda nao foram afundados.
+        
+        Returns:
+            list: Coordenadas (linha, coluna), em ordem de indice
+        """
+        return list(self.celulas(self.__registro.acertos & ~self.__registro.afundados))
+    
+    def celulas_livres(self):
+        """
+        Percorre as celulas que ainda nao receberam tiro.
+        
+        Yields:
+            tuple: (int, int) - Coordenadas (linha, coluna), em ordem de indice
+        """
+        tamanho = self.__registro.tamanho
+        return self.celulas(~self.__registro.tiros & ((1 << tamanho * tamanho) - 1))
+    
+    def celulas(self, mascara):
+        """
+        Percorre as celulas marcadas em uma bitmask.
+        
+        Args:
+            mascara (int): Bitmask de celulas
+        
+        Yields:
+            tuple: (int, int) - Coordenadas (linha, coluna) de cada bit ligado
+        """
+        while mascara:
+            bit = mascara & -mascara
+            yield self.coordenadas(bit.bit_length() - 1)
+            mascara ^= bit
+
+class VisaoTabuleiroEsparsa(VisaoTabuleiro):
+    """
+    Visao de um RegistroTirosEsparso: as consultas vao aos conjuntos de
+    indices do registro, sem montar bitmasks.
+    """
+    
+    def __init__(self, registro):
+        """
+        Inicializa a visao sobre um registro de tiros esparso.
+        
+        Args:
+            registro (RegistroTirosEsparso): Registro consultado pela visao
+        """
+        super().__init__(registro)
+        self.__registro = registro
+    
+    def tem_tiro(self, linha, coluna):
+        """
+        Verifica se uma posicao ja recebeu um tiro.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao ja recebeu um tiro, False caso contrario
+        """
+        return linha * self.__registro.tamanho + coluna in self.__registro.indices_tiros
+    
+    def tem_acerto(self, linha, coluna):
+        """
+        Verifica se um tiro nessa posicao atingiu um navio.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao tem um navio atingido, False caso contrario
+        """
+        return linha * self.__registro.tamanho + coluna in self.__registro.indices_acertos
+    
+    def tem_afundado(self, linha, coluna):
+        """
+        Verifica se a posicao pertence a um navio ja afundado.
+        
+        Args:
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao pertence a um navio afundado, False caso contrario
+        """
+        return linha * self.__registro.tamanho + coluna in self.__registro.indices_afundados
+    
+    def quantidade_tiros(self):
+        """
+        Conta as celulas que ja receberam tiro.
+        
+        Returns:
+            int: Quantidade de tiros
+        """
+        return len(self.__registro.indices_tiros)
+    
+    def acertos_ativos(self):
+        """
+        Lista os acertos em navios que ainda nao foram afundados.
+        
+        Returns:
+            list: Coordenadas (linha, coluna), em ordem de indice
+        """
+        ativos = self.__registro.indices_acertos - self.__registro.indices_afundados
+        return [self.coordenadas(indice) for indice in sorted(ativos)]
+    
+    def celulas_livres(self):
+        """
+        Percorre as celulas que ainda nao receberam tiro.
+        
+        Yields:
+            tuple: (int, int) - Coordenadas (linha, coluna), em ordem de indice
+        """
+        tiros = self.__registro.indices_tiros
+        for indice in range(self.__registro.tamanho * self.__registro.tamanho):
+            if indice not in tiros:
+                yield self.coordenadas(indice)
+
+class ConjuntoIndexado:
+    """
+    Conjunto com sorteio, insercao e remocao em O(1).
+    
+    Os elementos ficam em uma lista e um dicionario guarda o indice de cada
+    um; a remocao troca o elemento com o ultimo da lista antes de retira-lo.
+    """
+    
+    def __init__(self, elementos=()):
+        """
+        Inicializa o conjunto.
+        
+        Args:
+            elementos (iterable, optional): Elementos iniciais. Padrao eh vazio.
+        """
+        self.__elementos = []
+        self.__indices = {}
+        for elemento in elementos:
+            self.adicionar(elemento)
+    
+    def __len__(self):
+        """Retorna a quantidade de elementos."""
+        return len(self.__elementos)
+    
+    def __contains__(self, elemento):
+        """Verifica se o elemento pertence ao conjunto."""
+        return elemento in self.__indices
+    
+    def __iter__(self):
+        """Percorre os elementos do conjunto."""
+        return iter(self.__elementos)
+    
+    def adicionar(self, elemento):
+        """
+        Adiciona um elemento, se ainda nao estiver no conjunto.
+        
+        Args:
+            elemento: Elemento a ser adicionado
+        """
+        if elemento not in self.__indices:
+            self.__indices[elemento] = len(self.__elementos)
+            self.__elementos.append(elemento)
+    
+    def remover(self, elemento):
+        """
+        Remove um elemento, se estiver no conjunto.
+        
+        Args:
+            elemento: Elemento a ser removido
+        """
+        indice = self.__indices.pop(elemento, None)
+        if indice is None:
+            return
+        ultimo = self.__elementos.pop()
+        if indice < len(self.__elementos):
+            self.__elementos[indice] = ultimo
+            self.__indices[ultimo] = indice
+    
+    def sortear(self):
+        """
+        Sorteia um elemento sem remove-lo.
+        
+        Returns:
+            Elemento sorteado
+        """
+        return self.__elementos[random.randrange(len(self.__elementos))]
+
+class Estrategia(ABC):
+    """
+    Classe abstrata base para as estrategias de tiro da IA.
+    
+    Uma estrategia guarda apenas o seu proprio estado de decisao; o estado
+    do tabuleiro do oponente chega pela VisaoTabuleiro.
+    """
+    
+    @abstractmethod
+    def escolher_tiro(self, visao):
+        """
+        Metodo abstrato para escolher o proximo tiro.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+        
+        Returns:
+            tuple: (int, int) - Coordenadas do tiro (linha, coluna)
+        """
+        pass
+    
+    def registrar_resultado(self, visao, linha, coluna, acertou, navio_afundado=None):
+        """
+        Recebe o resultado do ultimo tiro. A visao ja inclui esse tiro.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+            linha (int): Linha do tiro
+            coluna (int): Coluna do tiro
+            acertou (bool): True se acertou um navio, False caso contrario
+            navio_afundado (Navio, optional): Navio afundado se houver. Padrao eh None.
+        """
+        pass
+    
+    def escolher_salva(self, visao, quantidade):
+        """
+        Escolhe os tiros de uma salva, todos antes de conhecer os resultados.
+        
+        Por padrao, usa escolher_tiro() para o primeiro tiro e completa a
+        salva sorteando celulas livres ainda nao escolhidas.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+            quantidade (int): Quantidade de tiros da salva
+        
+        Returns:
+            list: Coordenadas (linha, coluna) distintas, no maximo uma por celula livre
+        """
+        tamanho = visao.tamanho
+        total_livres = tamanho * tamanho - visao.quantidade_tiros()
+        quantidade = min(quantidade, total_livres)
+        if quantidade <= 0:
+            return []
+        
+        escolhidas = [self.escolher_tiro(visao)]
+        if 2 * total_livres < tamanho * tamanho:
+            # Com o tabuleiro mais cheio que vazio, sortear da lista de livres sai mais barato
+            restantes = [celula for celula in visao.celulas_livres() if celula != escolhidas[0]]
+            escolhidas.extend(random.sample(restantes, quantidade - 1))
+            return escolhidas
+        
+        reservadas = set(escolhidas)
+        while len(escolhidas) < quantidade:
+            celula = (random.randrange(tamanho), random.randrange(tamanho))
+            if celula not in reservadas and not visao.tem_tiro(*celula):
+                escolhidas.append(celula)
+                reservadas.add(celula)
+        return escolhidas
+
+class EstrategiaAleatoria(Estrategia):
+    """Atira sempre em uma posicao aleatoria ainda nao atingida."""
+    
+    def escolher_tiro(self, visao):
+        """
+        Escolhe uma posicao aleatoria livre.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+        
+        Returns:
+            tuple: (int, int) - Coordenadas do tiro (linha, coluna)
+        """
+        while True:
+            linha = random.randint(0, visao.tamanho - 1)
+            coluna = random.randint(0, visao.tamanho - 1)
+            
+            if not visao.tem_tiro(linha, coluna):
+                return linha, coluna
+
+class EstrategiaCacaAlvo(Estrategia):
+    """
+    Estrategia de caca e alvo: atira em um reticulado de paridade ate acertar
+    um navio e depois persegue os acertos pela fronteira de celulas adjacentes.
+    
+    Na caca, so sao consideradas as celulas livres com (linha + coluna)
+    multiplo do menor navio restante com mais de uma celula: qualquer um
+    desses navios cobre pelo menos uma delas. Navios de uma celula nao
+    reduzem o espacamento enquanto houver navios maiores, pois eles so
+    seriam achados com certeza varrendo o tabuleiro inteiro. O reticulado fica em um ConjuntoIndexado, entao
+    sortear e descartar celulas custa O(1); ele so eh refeito quando o
+    menor navio restante muda. Em tabuleiros com area acima de
+    AREA_MAXIMA_RETICULADO, a caca sorteia celulas do reticulado pela
+    aritmetica e descarta as ja atingidas, sem montar o conjunto; ele so eh
+    montado quando os sorteios passam a falhar, com o reticulado quase esgotado.
+    
+    Com um ModeloPosicionamento, cada tiro de caca sorteia algumas celulas
+    do reticulado e fica com a de maior probabilidade segundo o modelo.
+    
+    Depois de dois acertos em linha, a direcao do navio eh inferida e as
+    pontas da linha passam na frente da fronteira. Quando um navio afunda,
+    a fronteira eh refeita apenas a partir dos acertos que ainda nao
+    pertencem a navios afundados.
+    
+    Em uma salva, os tiros saem primeiro da fronteira e depois do
+    reticulado, sem repetir celulas: as escolhidas saem do reticulado na
+    hora, antes mesmo de os resultados chegarem. Os tiros de caca da salva
+    evitam celulas a ate um espacamento de distancia (Manhattan) das ja
+    escolhidas, para nao gastar dois tiros no mesmo trecho de navio.
+    """
+    
+    DIRECOES = ((-1, 0), (1, 0), (0, -1), (0, 1))  # cima, baixo, esquerda, direita
+    AREA_MAXIMA_RETICULADO = 4096  # acima disso o reticulado so eh montado quando quase esgotado
+    TENTATIVAS_SORTEIO = 64  # sorteios por celula antes de montar o reticulado
+    TENTATIVAS_ESPALHAMENTO = 4  # sorteios por tiro de caca da salva antes de aceitar uma celula proxima
+    
+    def __init__(self, modelo=None, amostras=4):
+        """
+        Inicializa a estrategia com a fronteira e o reticulado vazios.
+        
+        Args:
+            modelo (ModeloPosicionamento, optional): Habitos de posicionamento do oponente. Padrao eh None.
+            amostras (int, optional): Celulas sorteadas por tiro de caca quando ha modelo. Padrao eh 4.
+        """
+        self.__modelo = modelo
+        self.__amostras = amostras
+        self.__fronteira = deque()
+        self.__na_fronteira = set()
+        self.__reticulado = None  # None enquanto a caca sorteia pela aritmetica
+        self.__espacamento = None
+        self.__deslocamento = random.randrange(60)  # 60 eh divisivel por todos os tamanhos da frota padrao
+    
+    def escolher_tiro(self, visao):
+        """
+        Escolhe o proximo tiro.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+        
+        Returns:
+            tuple: (int, int) - Coordenadas do tiro (linha, coluna)
+        """
+        # Modo alvo: tenta as celulas da fronteira
+        celula = self.__proxima_da_fronteira(visao)
+        if celula is None and self.__reabastecer_fronteira(visao):
+            celula = self.__proxima_da_fronteira(visao)
+        if celula is not None:
+            return celula
+        
+        # Modo caca: sorteia uma celula do reticulado de paridade
+        espacamento = self.__espacamento_da_caca(visao)
+        if self.__modelo is None or self.__modelo.tamanho != visao.tamanho:
+            return self.__sortear_caca(visao, espacamento)
+        candidatas = [self.__sortear_caca(visao, espacamento) for _ in range(self.__amostras)]
+        return max(candidatas, key=lambda celula: self.__modelo.prior(*celula))
+    
+    def escolher_salva(self, visao, quantidade):
+        """
+        Escolhe os tiros de uma salva em conjunto.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+            quantidade (int): Quantidade de tiros da salva
+        
+        Returns:
+            list: Coordenadas (linha, coluna) distintas, no maximo uma por celula livre
+        """
+        escolhidas = []
+        reservadas = set()
+        
+        # Modo alvo: esgota a fronteira antes de cacar; como em escolher_tiro,
+        # ela so eh reabastecida se nao tinha nenhuma celula
+        reabastecida = False
+        while len(escolhidas) < quantidade:
+            celula = self.__proxima_da_fronteira(visao)
+            if celula is None:
+                if reabastecida or escolhidas or not self.__reabastecer_fronteira(visao):
+                    break
+                reabastecida = True
+            elif celula not in reservadas:
+                escolhidas.append(celula)
+                reservadas.add(celula)
+        
+        # Modo caca: as celulas escolhidas saem do reticulado para nao repetir
+        espacamento = self.__espacamento_da_caca(visao)
+        if self.__reticulado is not None:
+            for celula in reservadas:
+                self.__reticulado.remover(celula)
+        
+        amostras = self.__amostras if self.__modelo is not None and self.__modelo.tamanho == visao.tamanho else 1
+        while len(escolhidas) < quantidade:
+            celula = self.__sortear_espalhada(visao, espacamento, reservadas, escolhidas, amostras)
+            if celula is None:
+                break
+            if self.__reticulado is not None:
+                self.__reticulado.remover(celula)
+            escolhidas.append(celula)
+            reservadas.add(celula)
+        return escolhidas
+    
+    def registrar_resultado(self, visao, linha, coluna, acertou, navio_afundado=None):
+        """
+        Atualiza a fronteira com o resultado do ultimo tiro.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+            linha (int): Linha do tiro
+            coluna (int): Coluna do tiro
+            acertou (bool): True se acertou um navio, False caso contrario
+            navio_afundado (Navio, optional): Navio afundado se houver. Padrao eh None.
+        """
+        if self.__reticulado is not None:
+            self.__reticulado.remover((linha, coluna))
+        
+        if navio_afundado is not None:
+            # Refaz a fronteira a partir dos acertos em navios ainda nao afundados
+            self.__fronteira.clear()
+            self.__na_fronteira.clear()
+            for linha_ativa, coluna_ativa in visao.acertos_ativos():
+                self.__mirar(visao, linha_ativa, coluna_ativa)
+        elif acertou:
+            self.__mirar(visao, linha, coluna)
+    
+    def __espacamento_da_caca(self, visao):
+        """
+        Calcula o espacamento do reticulado de caca.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+        
+        Returns:
+            int: Tamanho do menor navio restante com mais de uma celula, ou 1 se so
+                 restam navios de uma celula
+        """
+        return min((tamanho for tamanho in visao.frota_restante if tamanho > 1), default=1)
+    
+    def __sortear_caca(self, visao, espacamento, reservadas=()):
+        """
+        Sorteia uma celula livre do reticulado de caca.
+        
+        Em tabuleiros pequenos, ou depois que os sorteios pela aritmetica
+        falham, a celula sai do reticulado montado (que eh remontado quando
+        esvazia ou o espacamento muda).
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+            espacamento (int): Espacamento do reticulado de caca
+            reservadas (set, optional): Celulas ja escolhidas na salva atual. Padrao eh vazio.
+        
+        Returns:
+            tuple: (int, int) - Coordenadas da celula, ou None se nao ha celula livre
+        """
+        if espacamento != self.__espacamento:
+            self.__reticulado = None
+            self.__espacamento = espacamento
+        
+        if self.__reticulado is None and visao.tamanho * visao.tamanho > self.AREA_MAXIMA_RETICULADO:
+            celula = self.__sortear_reticulado_implicito(visao, espacamento, reservadas)
+            if celula is not None:
+                return celula
+        
+        if not self.__reticulado:
+            self.__montar_reticulado(visao, espacamento, reservadas)
+            if not self.__reticulado:
+                return None
+        return self.__reticulado.sortear()
+    
+    def __sortear_espalhada(self, visao, espacamento, reservadas, escolhidas, amostras):
+        """
+        Sorteia um tiro de caca da salva longe dos tiros ja escolhidos nela.
+        
+        Refaz o sorteio ate TENTATIVAS_ESPALHAMENTO vezes enquanto a celula
+        ficar a ate um espacamento de distancia de alguma escolhida; se todas
+        as tentativas falharem (reticulado quase esgotado), aceita a ultima.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+            espacamento (int): Espacamento do reticulado de caca
+            reservadas (set): Celulas ja escolhidas na salva atual
+            escolhidas (list): Celulas ja escolhidas na salva atual, em ordem
+            amostras (int): Celulas sorteadas por tiro quando ha modelo
+        
+        Returns:
+            tuple: (int, int) - Coordenadas da celula, ou None se nao ha celula livre
+        """
+        celula = None
+        for _ in range(self.TENTATIVAS_ESPALHAMENTO):
+            candidatas = [self.__sortear_caca(visao, espacamento, reservadas) for _ in range(amostras)]
+            if None in candidatas:
+                return None
+            celula = candidatas[0] if amostras == 1 else max(candidatas, key=lambda celula: self.__modelo.prior(*celula))
+            linha, coluna = celula
+            if all(abs(linha - outra_linha) + abs(coluna - outra_coluna) > espacamento
+                   for outra_linha, outra_coluna in escolhidas):
+                break
+        return celula
+    
+    def __sortear_reticulado_implicito(self, visao, espacamento, reservadas):
+        """
+        Sorteia uma celula do reticulado sem monta-lo, descartando as ja atingidas.
+        
+        A coluna eh gerada ja no reticulado a partir da linha sorteada, entao
+        cada tentativa custa O(1) e so falha se a celula ja foi atingida.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+            espacamento (int): Espacamento do reticulado de caca
+            reservadas (set): Celulas ja escolhidas na salva atual
+        
+        Returns:
+            tuple: (int, int) - Coordenadas da celula, ou None se todas as tentativas falharam
+        """
+        tamanho = visao.tamanho
+        for _ in range(self.TENTATIVAS_SORTEIO):
+            linha = random.randrange(tamanho)
+            primeira = (self.__deslocamento - linha) % espacamento
+            if primeira >= tamanho:
+                continue
+            coluna = primeira + espacamento * random.randrange((tamanho - 1 - primeira) // espacamento + 1)
+            if not visao.tem_tiro(linha, coluna) and (linha, coluna) not in reservadas:
+                return linha, coluna
+        return None
+    
+    def __montar_reticulado(self, visao, espacamento, reservadas=()):
+        """
+        Refaz o reticulado de caca com as celulas livres no espacamento dado.
+        
+        As celulas do reticulado sao geradas pela aritmetica, linha a linha,
+        entao montar custa O(area / espacamento) consultas. Se nenhuma celula
+        livre cair no reticulado, usa todas as celulas livres.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+            espacamento (int): Espacamento do reticulado de caca
+            reservadas (set, optional): Celulas ja escolhidas na salva atual. Padrao eh vazio.
+        """
+        tamanho = visao.tamanho
+        celulas = [(linha, coluna) for linha in range(tamanho)
+                   for coluna in range((self.__deslocamento - linha) % espacamento, tamanho, espacamento)
+                   if not visao.tem_tiro(linha, coluna) and (linha, coluna) not in reservadas]
+        if not celulas:
+            celulas = [celula for celula in visao.celulas_livres() if celula not in reservadas]
+        
+        self.__reticulado = ConjuntoIndexado(celulas)
+    
+    def __reabastecer_fronteira(self, visao):
+        """
+        Volta a colocar na fronteira os vizinhos de todos os acertos ativos.
+        
+        A inferencia de direcao pode esgotar a fronteira quando ha navios
+        encostados; nesse caso os vizinhos de todos os acertos voltam a ser tentados.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+        
+        Returns:
+            bool: True se havia acertos ativos, False caso contrario
+        """
+        ativos = visao.acertos_ativos()
+        for linha, coluna in ativos:
+            for dl, dc in self.DIRECOES:
+                self.__adicionar(visao, linha + dl, coluna + dc)
+        return bool(ativos)
+    
+    def __proxima_da_fronteira(self, visao):
+        """
+        Retira a proxima celula livre da fronteira.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+        
+        Returns:
+            tuple: (int, int) - Coordenadas da celula, ou None se a fronteira esvaziou
+        """
+        while self.__fronteira:
+            celula = self.__fronteira.popleft()
+            self.__na_fronteira.discard(celula)
+            if not visao.tem_tiro(*celula):
+                return celula
+        return None
+    
+    def __mirar(self, visao, linha, coluna):
+        """
+        Adiciona a fronteira os alvos gerados por um acerto.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+            linha (int): Linha do acerto
+            coluna (int): Coluna do acerto
+        """
+        direcao = self.__direcao_da_linha(visao, linha, coluna)
+        if direcao is None:
+            for dl, dc in self.DIRECOES:
+                self.__adicionar(visao, linha + dl, coluna + dc)
+            return
+        
+        # Com a direcao conhecida, as pontas da linha de acertos vem primeiro
+        dl, dc = direcao
+        for sentido in (1, -1):
+            nova_linha, nova_coluna = linha, coluna
+            while self.__acerto_ativo(visao, nova_linha, nova_coluna):
+                nova_linha += dl * sentido
+                nova_coluna += dc * sentido
+            self.__adicionar(visao, nova_linha, nova_coluna, prioridade=True)
+    
+    def __direcao_da_linha(self, visao, linha, coluna):
+        """
+        Infere a direcao do navio a partir de acertos vizinhos.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+            linha (int): Linha do acerto
+            coluna (int): Coluna do acerto
+        
+        Returns:
+            tuple: (int, int) - Passo da linha de acertos, ou None se nao ha acerto vizinho
+        """
+        if (self.__acerto_ativo(visao, linha, coluna - 1) or
+                self.__acerto_ativo(visao, linha, coluna + 1)):
+            return (0, 1)
+        if (self.__acerto_ativo(visao, linha - 1, coluna) or
+                self.__acerto_ativo(visao, linha + 1, coluna)):
+            return (1, 0)
+        return None
+    
+    def __acerto_ativo(self, visao, linha, coluna):
+        """
+        Verifica se a posicao tem um acerto em navio ainda nao afundado.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+            linha (int): Linha a ser verificada
+            coluna (int): Coluna a ser verificada
+        
+        Returns:
+            bool: True se a posicao tem um acerto ativo, False caso contrario
+        """
+        return (visao.posicao_valida(linha, coluna) and
+                visao.tem_acerto(linha, coluna) and
+                not visao.tem_afundado(linha, coluna))
+    
+    def __adicionar(self, visao, linha, coluna, prioridade=False):
+        """
+        Adiciona uma celula livre a fronteira.
+        
+        Args:
+            visao (VisaoTabuleiro): Visao do tabuleiro do oponente
+            linha (int): Linha da celula
+            coluna (int): Coluna da celula
+            prioridade (bool, optional): Se True, a celula vai para o inicio da fronteira. Padrao eh False.
+        """
+        if not visao.celula_livre(linha, coluna):
+            return
+        
+        celula = (linha, coluna)
+        if prioridade:
+            # Move a celula para o inicio em vez de duplica-la (a fronteira tem poucas celulas)
+            if celula in self.__na_fronteira:
+                self.__fronteira.remove(celula)
+            self.__fronteira.appendleft(celula)
+        elif celula not in self.__na_fronteira:
+            self.__fronteira.append(celula)
+        self.__na_fronteira.add(celula)
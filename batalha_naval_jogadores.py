@@ -1,20 +1,28 @@
 from abc import ABC, abstractmethod
-import random
-from batalha_naval_classes import Posicao, Tabuleiro, PortaAvioes, Encouracado, Cruzador, Submarino, Destroyer
+from batalha_naval_classes import Tabuleiro, TabuleiroEsparso, criar_frota_padrao, posicionar_frota_aleatoria
+from batalha_naval_estrategias import EstrategiaCacaAlvo, criar_registro_tiros
+from batalha_naval_posicionamento import aplicar_layout
 
 class Jogador(ABC):
     """Classe abstrata base para todos os jogadores."""
     
-    def __init__(self, nome):
+    def __init__(self, nome, tamanho_tabuleiro=10, esparso=False):
         """
         Inicializa um jogador com nome e tabuleiro.
         
+        Os tiros contra o oponente ficam em um registro de tiros (esparso se o
+        tabuleiro for), em vez de uma segunda copia do tabuleiro.
+        
         Args:
             nome (str): Nome do jogador
+            tamanho_tabuleiro (int, optional): Tamanho dos tabuleiros. Padrao eh 10.
+            esparso (bool, optional): Se True, usa TabuleiroEsparso. Padrao eh False.
         """
+        classe_tabuleiro = TabuleiroEsparso if esparso else Tabuleiro
         self.__nome = nome
-        self.__tabuleiro = Tabuleiro()
-        self.__tabuleiro_oponente = Tabuleiro()  # Tabuleiro para rastrear os tiros contra o oponente
+        self.__tabuleiro = classe_tabuleiro(tamanho_tabuleiro)
+        frota = [navio.tamanho for navio in criar_frota_padrao()]
+        self.__registro = criar_registro_tiros(tamanho_tabuleiro, frota, esparso or None)  # Tiros contra o oponente
     
     @property
     def nome(self):
@@ -26,10 +34,20 @@ class Jogador(ABC):
         """Retorna o tabuleiro do jogador."""
         return self.__tabuleiro
     
+    @property
+    def registro(self):
+        """Retorna o registro dos tiros do jogador contra o oponente."""
+        return self.__registro
+    
     @property
     def tabuleiro_oponente(self):
-        """Retorna o tabuleiro do oponente do jogador."""
-        return self.__tabuleiro_oponente
+        """
+        Retorna o que o jogador sabe do tabuleiro do oponente.
+        
+        Eh a visao do registro de tiros, que responde posicao_tem_tiro() e
+        posicao_tem_navio_atingido() como um Tabuleiro.
+        """
+        return self.__registro.visao
     
     def inicializar_frota(self):
         """Inicializa a frota do jogador."""
@@ -60,7 +78,7 @@ class Jogador(ABC):
             acertou (bool): True se acertou um navio, False caso contrario
             navio_afundado (Navio, optional): Navio afundado se houver. Padrao eh None.
         """
-        self.__tabuleiro_oponente.receber_tiro(linha, coluna)
+        self.__registro.registrar(linha, coluna, acertou, navio_afundado)
     
     def perdeu(self):
         """
@@ -70,18 +88,31 @@ class Jogador(ABC):
             bool: True se todos os navios do jogador estao afundados, False caso contrário
         """
         return self.__tabuleiro.todos_navios_afundados()
+    
+    def navios_restantes(self):
+        """
+        Conta os navios do jogador que ainda nao foram afundados.
+        
+        No modo salva, eh a quantidade de tiros do jogador por turno.
+        
+        Returns:
+            int: Quantidade de navios a flutuar
+        """
+        return sum(1 for navio in self.__tabuleiro.navios if not navio.esta_afundado())
 
 class JogadorHumano(Jogador):
     """Representa um jogador humano."""
     
-    def __init__(self, nome="Jogador"):
+    def __init__(self, nome="Jogador", tamanho_tabuleiro=10, esparso=False):
         """
         Inicializa um jogador humano.
         
         Args:
             nome (str, optional): Nome do jogador. Padrao eh "Jogador".
+            tamanho_tabuleiro (int, optional): Tamanho dos tabuleiros. Padrao eh 10.
+            esparso (bool, optional): Se True, usa TabuleiroEsparso. Padrao eh False.
         """
-        super().__init__(nome)
+        super().__init__(nome, tamanho_tabuleiro, esparso)
     
     def _adicionar_navios(self):
         """Adiciona os navios ao tabuleiro do jogador humano."""
@@ -102,78 +133,62 @@ class JogadorHumano(Jogador):
 class JogadorIA(Jogador):
     """Representa um jogador controlado por IA."""
     
-    def __init__(self, nome="Computador"):
+    def __init__(self, nome="Computador", tamanho_tabuleiro=10, esparso=False, estrategia=None, layouts=None):
         """
         Inicializa um jogador IA.
         
         Args:
             nome (str, optional): Nome do jogador. Padrao eh "Computador".
+            tamanho_tabuleiro (int, optional): Tamanho dos tabuleiros. Padrao eh 10.
+            esparso (bool, optional): Se True, usa TabuleiroEsparso. Padrao eh False.
+            estrategia (Estrategia, optional): Estrategia de tiro. Padrao eh EstrategiaCacaAlvo.
+            layouts (PoolLayouts, optional): Pool de layouts otimizados para a frota.
+                Padrao eh None (posicionamento aleatorio).
         """
-        super().__init__(nome)
-        self.__tiros_acertados = []
-        self.__tiros_pendentes = []
+        super().__init__(nome, tamanho_tabuleiro, esparso)
+        self.__estrategia = estrategia if estrategia is not None else EstrategiaCacaAlvo()
+        self.__layouts = layouts
+    
+    @property
+    def estrategia(self):
+        """Retorna a estrategia de tiro do jogador IA."""
+        return self.__estrategia
     
     def _adicionar_navios(self):
-        """Adiciona os navios ao tabuleiro do jogador IA de forma aleatoria."""
-        navios = [
-            PortaAvioes(),
-            Encouracado(),
-            Cruzador(),
-            Submarino(),
-            Destroyer()
-        ]
-        
-        for navio in navios:
-            while True:
-                linha = random.randint(0, self.tabuleiro.tamanho - 1)
-                coluna = random.randint(0, self.tabuleiro.tamanho - 1)
-                orientacao = random.choice(['horizontal', 'vertical'])
-                
-                if self.tabuleiro.adicionar_navio(navio, linha, coluna, orientacao):
-                    break
+        """
+        Adiciona os navios ao tabuleiro do jogador IA, usando um layout do pool
+        se houver um para o tamanho do tabuleiro, ou de forma aleatoria.
+        
+        O layout eh conferido em um tabuleiro de rascunho antes, para que um
+        layout que nao cabe nao deixe a frota posicionada pela metade.
+        """
+        if self.__layouts is not None and self.__layouts.tamanho == self.tabuleiro.tamanho:
+            layout = self.__layouts.escolher()
+            if aplicar_layout(TabuleiroEsparso(self.tabuleiro.tamanho), layout):
+                aplicar_layout(self.tabuleiro, layout)
+                return
+        posicionar_frota_aleatoria(self.tabuleiro, criar_frota_padrao())
     
     def fazer_jogada(self):
         """
-        Implementa a lógica de jogada da IA.
+        Implementa a lógica de jogada da IA, delegando a escolha a estrategia.
         
         Returns:
             tuple: (int, int) - Coordenadas da jogada (linha, coluna)
         """
-        # Se há tiros pendentes (áreas ao redor de acertos anteriores), tenta-os primeiro
-        if self.__tiros_pendentes:
-            linha, coluna = self.__tiros_pendentes.pop(0)
-            return linha, coluna
-        
-        # Se há tiros acertados, tenta atirar ao redor deles
-        if self.__tiros_acertados:
-            ultima_linha, ultima_coluna = self.__tiros_acertados[-1]
-            possiveis_tiros = []
-            
-            # Tenta atirar nas quatro direcoes adjacentes
-            direcoes = [(-1, 0), (1, 0), (0, -1), (0, 1)]  # cima, baixo, esquerda, direita
-            
-            for dl, dc in direcoes:
-                nova_linha, nova_coluna = ultima_linha + dl, ultima_coluna + dc
-                
-                # Verifica se a posição é válida e não foi atingida antes
-                if (0 <= nova_linha < self.tabuleiro_oponente.tamanho and 
-                    0 <= nova_coluna < self.tabuleiro_oponente.tamanho and 
-                    not self.tabuleiro_oponente.posicao_tem_tiro(nova_linha, nova_coluna)):
-                    possiveis_tiros.append((nova_linha, nova_coluna))
-            
-            # Se há tiros possíveis, adiciona à lista de pendentes e usa o primeiro
-            if possiveis_tiros:
-                self.__tiros_pendentes.extend(possiveis_tiros)
-                linha, coluna = self.__tiros_pendentes.pop(0)
-                return linha, coluna
-        
-        # Caso contrário, faz um tiro aleatório
-        while True:
-            linha = random.randint(0, self.tabuleiro_oponente.tamanho - 1)
-            coluna = random.randint(0, self.tabuleiro_oponente.tamanho - 1)
-            
-            if not self.tabuleiro_oponente.posicao_tem_tiro(linha, coluna):
-                return linha, coluna
+        return self.__estrategia.escolher_tiro(self.registro.visao)
+    
+    def fazer_salva(self, quantidade):
+        """
+        Escolhe todos os tiros de uma salva de uma vez, delegando a estrategia.
+        
+        Args:
+            quantidade (int): Quantidade de tiros da salva
+        
+        Returns:
+            list: Coordenadas (linha, coluna) distintas dos tiros
+        """
+        return self.__estrategia.escolher_salva(self.registro.visao, quantidade)
     
     def registrar_resultado_tiro(self, linha, coluna, acertou, navio_afundado=None):
         """
@@ -187,10 +202,8 @@ class JogadorIA(Jogador):
         """
         super().registrar_resultado_tiro(linha, coluna, acertou, navio_afundado)
         
-        if acertou:
-            self.__tiros_acertados.append((linha, coluna))
-        elif navio_afundado:
-            # Se afundou um navio, limpa os tiros acertados e pendentes
-            # para começar a procurar um novo navio
-            self.__tiros_acertados.clear()
-            self.__tiros_pendentes.clear()
\ No newline at end of file
+        # So repassa o navio para a estrategia se o tiro realmente o afundou
+        if navio_afundado is not None and not navio_afundado.esta_afundado():
+            navio_afundado = None
+        
+        self.__estrategia.registrar_resultado(self.registro.visao, linha, coluna, acertou, navio_afundado)
\ No newline at end of file
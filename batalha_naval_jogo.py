@@ -1,17 +1,41 @@
 import os
 import time
-from batalha_naval_classes import Tabuleiro, PortaAvioes, Encouracado, Cruzador, Submarino, Destroyer
+from batalha_naval_classes import criar_frota_padrao
+from batalha_naval_estrategias import EstrategiaCacaAlvo
 from batalha_naval_jogadores import JogadorHumano, JogadorIA
+from batalha_naval_modelagem import ModeloPosicionamento, registrar_partida
+from batalha_naval_posicionamento import ARQUIVO_LAYOUTS, PoolLayouts
+from batalha_naval_replay import GravacaoPartida
+
+# Arquivo com os habitos de posicionamento do jogador, atualizado a cada partida
+ARQUIVO_MODELO = "batalha_naval_modelo.bin"
 
 class Jogo:
     """Classe principal que controla o fluxo do jogo."""
     
-    def __init__(self):
-        """Inicializa o jogo."""
+    def __init__(self, caminho_modelo=None, caminho_layouts=None):
+        """
+        Inicializa o jogo.
+        
+        Args:
+            caminho_modelo (str, optional): Arquivo do modelo de posicionamento do jogador.
+                Se informado, a IA usa o modelo e cada partida terminada o atualiza. Padrão é None.
+            caminho_layouts (str, optional): Arquivo do pool de layouts otimizados da IA.
+                Se o arquivo existir, a IA posiciona a frota com um desses layouts. Padrão é None.
+        """
+        self.__caminho_modelo = caminho_modelo
         self.__jogador_humano = JogadorHumano("Jogador")
-        self.__jogador_ia = JogadorIA("Computador")
+        self.__jogador_ia = JogadorIA("Computador",
+                                      estrategia=EstrategiaCacaAlvo(self.__carregar_modelo()),
+                                      layouts=self.__carregar_layouts(caminho_layouts))
         self.__jogador_atual = self.__jogador_humano
         self.__em_execucao = False
+        self.__gravacao = None
+    
+    @property
+    def gravacao(self):
+        """Retorna a gravacao da partida, ou None antes de os navios serem posicionados."""
+        return self.__gravacao
     
     def iniciar(self):
         """Inicia o jogo."""
@@ -20,6 +44,37 @@ class Jogo:
         self.__configurar_jogo()
         self.__jogar()
     
+    def __carregar_modelo(self):
+        """
+        Carrega o modelo de posicionamento do jogador, se houver.
+        
+        Returns:
+            ModeloPosicionamento: Modelo carregado, ou None se nao ha modelo disponivel
+        """
+        if self.__caminho_modelo is None or not os.path.exists(self.__caminho_modelo):
+            return None
+        try:
+            return ModeloPosicionamento.carregar(self.__caminho_modelo)
+        except (OSError, ValueError):
+            return None
+    
+    def __carregar_layouts(self, caminho_layouts):
+        """
+        Carrega o pool de layouts da IA, se houver.
+        
+        Args:
+            caminho_layouts (str): Arquivo do pool de layouts, ou None
+        
+        Returns:
+            PoolLayouts: Pool carregado, ou None se nao ha pool disponivel
+        """
+        if caminho_layouts is None or not os.path.exists(caminho_layouts):
+            return None
+        try:
+            return PoolLayouts.carregar(caminho_layouts)
+        except (OSError, ValueError):
+            return None
+    
     def __mostrar_titulo(self):
         """Exibe o titulo do jogo."""
         self.__limpar_tela()
@@ -41,18 +96,15 @@ class Jogo:
         
         # Posiciona os navios do jogador humano
         self.__posicionar_navios_jogador()
+        
+        # Comeca a gravar a partida para poder revê-la depois
+        self.__gravacao = GravacaoPartida.de_tabuleiros(
+            self.__jogador_humano.tabuleiro, self.__jogador_ia.tabuleiro,
+            (self.__jogador_humano.nome, self.__jogador_ia.nome))
     
     def __posicionar_navios_jogador(self):
         """Permite ao jogador posicionar seus navios."""
-        navios = [
-            PortaAvioes(),
-            Encouracado(),
-            Cruzador(),
-            Submarino(),
-            Destroyer()
-        ]
-        
-        for navio in navios:
+        for navio in criar_frota_padrao():
             while True:
                 self.__limpar_tela()
                 print(f"Posicionando {navio.nome} ({navio.tamanho} posicoes)")
@@ -167,7 +219,8 @@ class Jogo:
                 print(f"Erro: {e}")
         
         acertou, navio = self.__jogador_ia.tabuleiro.receber_tiro(linha, coluna)
-        self.__jogador_humano.registrar_resultado_tiro(linha, coluna, acertou, navio if acertou else None)
+        self.__gravacao.registrar_tiro(0, linha, coluna)
+        self.__jogador_humano.registrar_resultado_tiro(linha, coluna, acertou, navio if acertou and navio.esta_afundado() else None)
         
         self.__limpar_tela()
         self.__mostrar_status_jogo()
@@ -188,7 +241,8 @@ class Jogo:
         
         linha, coluna = self.__jogador_ia.fazer_jogada()
         acertou, navio = self.__jogador_humano.tabuleiro.receber_tiro(linha, coluna)
-        self.__jogador_ia.registrar_resultado_tiro(linha, coluna, acertou, navio if acertou else None)
+        self.__gravacao.registrar_tiro(1, linha, coluna)
+        self.__jogador_ia.registrar_resultado_tiro(linha, coluna, acertou, navio if acertou and navio.esta_afundado() else None)
         
         self.__limpar_tela()
         self.__mostrar_status_jogo()
@@ -211,6 +265,8 @@ class Jogo:
         Args:
             vitoria (bool): True se o jogador humano venceu, False caso contrário
         """
+        self.__gravacao.vencedor = 0 if vitoria else 1
+        
         self.__limpar_tela()
         print("=" * 50)
         if vitoria:
@@ -230,6 +286,14 @@ class Jogo:
         self.__mostrar_tabuleiro_oponente(mostrar_navios=True)
         print()
         
+        # Registra como o jogador posicionou os navios para as proximas partidas
+        if self.__caminho_modelo is not None:
+            try:
+                registrar_partida(self.__caminho_modelo, self.__jogador_humano.tabuleiro)
+            except (OSError, ValueError) as e:
+                print(f"Nao foi possivel atualizar o modelo do jogador: {e}")
+                print()
+        
         self.__em_execucao = False
         input("Pressione ENTER para encerrar o jogo...")
     
@@ -344,7 +408,7 @@ class InterfaceJogo:
             opcao = input("Escolha uma opcao (1-2): ").strip()
             
             if opcao == "1":
-                jogo = Jogo()
+                jogo = Jogo(ARQUIVO_MODELO, ARQUIVO_LAYOUTS)
                 jogo.iniciar()
             elif opcao == "2":
                 return
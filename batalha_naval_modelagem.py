@@ -0,0 +1,173 @@
+from array import array
+import os
+import struct
+import sys
+
+# Cabecalho do arquivo: identificador, tamanho do tabuleiro e partidas registradas
+FORMATO_CABECALHO = '<4sII'
+IDENTIFICADOR = b'BNMP'
+TAMANHO_CABECALHO = struct.calcsize(FORMATO_CABECALHO)
+
+class ModeloPosicionamento:
+    """
+    Modelo dos habitos de posicionamento de um oponente.
+    
+    Guarda, para cada celula, em quantas partidas registradas havia um navio
+    nela. O arquivo em disco eh o cabecalho seguido das contagens (uint32
+    little-endian), entao carregar eh uma unica leitura e salvar uma unica
+    escrita, sempre em um arquivo temporario que substitui o original.
+    """
+    
+    def __init__(self, tamanho=10):
+        """
+        Inicializa um modelo sem partidas registradas.
+        
+        Args:
+            tamanho (int, optional): Tamanho do tabuleiro. Padrao eh 10.
+        """
+        self.__tamanho = tamanho
+        self.__partidas = 0
+        self.__contagens = array('I', bytes(4 * tamanho * tamanho))
+    
+    @property
+    def tamanho(self):
+        """Retorna o tamanho do tabuleiro modelado."""
+        return self.__tamanho
+    
+    @property
+    def partidas(self):
+        """Retorna a quantidade de partidas registradas."""
+        return self.__partidas
+    
+    def registrar_tabuleiro(self, tabuleiro):
+        """
+        Registra o posicionamento dos navios de um tabuleiro.
+        
+        Args:
+            tabuleiro (Tabuleiro): Tabuleiro com os navios do oponente
+        """
+        for linha, coluna in celulas_ocupadas(tabuleiro):
+            self.__contagens[linha * self.__tamanho + coluna] += 1
+        self.__partidas += 1
+    
+    def prior(self, linha, coluna):
+        """
+        Estima a probabilidade de haver um navio na celula.
+        
+        Usa suavizacao de Laplace, entao um modelo vazio retorna 0.5 para todas as celulas.
+        
+        Args:
+            linha (int): Linha da celula
+            coluna (int): Coluna da celula
+        
+        Returns:
+            float: Probabilidade estimada de haver um navio na celula
+        """
+        return (self.__contagens[linha * self.__tamanho + coluna] + 1) / (self.__partidas + 2)
+    
+    def salvar(self, caminho):
+        """
+        Salva o modelo em disco, substituindo o arquivo de forma atomica.
+        
+        Args:
+            caminho (str): Caminho do arquivo
+        """
+        contagens = array('I', self.__contagens)
+        if sys.byteorder == 'big':
+            contagens.byteswap()
+        
+        temporario = caminho + '.tmp'
+        with open(temporario, 'wb') as arquivo:
+            arquivo.write(struct.pack(FORMATO_CABECALHO, IDENTIFICADOR, self.__tamanho, self.__partidas))
+            contagens.tofile(arquivo)
+        os.replace(temporario, caminho)
+    
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Carrega um modelo salvo em disco.
+        
+        Args:
+            caminho (str): Caminho do arquivo
+        
+        Returns:
+            ModeloPosicionamento: Modelo carregado
+        
+        Raises:
+            ValueError: Se o arquivo nao for um modelo valido
+        """
+        with open(caminho, 'rb') as arquivo:
+            tamanho, partidas = _ler_cabecalho(arquivo)
+            contagens = array('I')
+            try:
+                contagens.fromfile(arquivo, tamanho * tamanho)
+            except EOFError:
+                raise ValueError(f"Arquivo de modelo incompleto: {caminho}")
+        
+        if sys.byteorder == 'big':
+            contagens.byteswap()
+        
+        modelo = cls(tamanho)
+        modelo.__partidas = partidas
+        modelo.__contagens = contagens
+        return modelo
+
+def celulas_ocupadas(tabuleiro):
+    """
+    Lista as celulas ocupadas pelos navios de um tabuleiro.
+    
+    Args:
+        tabuleiro (Tabuleiro): Tabuleiro com os navios posicionados
+    
+    Returns:
+        list: Lista de tuplas (linha, coluna)
+    """
+    return [celula for navio in tabuleiro.navios for celula in navio.celulas()]
+
+def registrar_partida(caminho, tabuleiro):
+    """
+    Acrescenta o posicionamento de um tabuleiro ao modelo salvo em disco.
+    
+    O modelo eh carregado, atualizado e salvo com salvar(), que substitui o
+    arquivo de forma atomica: uma interrupcao no meio deixa o arquivo antigo
+    intacto, nunca contagens fora de sincronia com o cabecalho. Se o arquivo
+    ainda nao existir, cria um modelo novo.
+    
+    Args:
+        caminho (str): Caminho do arquivo do modelo
+        tabuleiro (Tabuleiro): Tabuleiro com os navios do oponente
+    
+    Raises:
+        ValueError: Se o arquivo existente nao for um modelo do mesmo tamanho ou
+            estiver incompleto (nesse caso nada eh alterado)
+    """
+    if not os.path.exists(caminho):
+        modelo = ModeloPosicionamento(tabuleiro.tamanho)
+    else:
+        modelo = ModeloPosicionamento.carregar(caminho)
+        if modelo.tamanho != tabuleiro.tamanho:
+            raise ValueError(f"O modelo em {caminho} eh de um tabuleiro {modelo.tamanho}x{modelo.tamanho}")
+    
+    modelo.registrar_tabuleiro(tabuleiro)
+    modelo.salvar(caminho)
+
+def _ler_cabecalho(arquivo):
+    """
+    Le e valida o cabecalho de um arquivo de modelo.
+    
+    Args:
+        arquivo (file): Arquivo binario posicionado no inicio
+    
+    Returns:
+        tuple: (int, int) - Tamanho do tabuleiro e partidas registradas
+    
+    Raises:
+        ValueError: Se o cabecalho for invalido
+    """
+    cabecalho = arquivo.read(TAMANHO_CABECALHO)
+    if len(cabecalho) != TAMANHO_CABECALHO:
+        raise ValueError("Arquivo de modelo sem cabecalho")
+    identificador, tamanho, partidas = struct.unpack(FORMATO_CABECALHO, cabecalho)
+    if identificador != IDENTIFICADOR:
+        raise ValueError("Arquivo nao eh um modelo de posicionamento")
+    return tamanho, partidas
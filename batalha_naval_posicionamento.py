@@ -0,0 +1,360 @@
+from concurrent.futures import ProcessPoolExecutor
+import json
+import os
+import random
+from batalha_naval_classes import TabuleiroEsparso, criar_frota_padrao, posicionar_frota_aleatoria
+from batalha_naval_estrategias import EstrategiaCacaAlvo
+from batalha_naval_simulacao import simular_partida
+
+# Arquivo padrao do pool de layouts gerado por este modulo
+ARQUIVO_LAYOUTS = "batalha_naval_layouts.json"
+
+def sortear_layout(tamanho=10):
+    """
+    Sorteia um layout valido para a frota padrao.
+    
+    Um layout eh uma tupla com (linha, coluna, orientacao) de cada navio, na
+    ordem de criar_frota_padrao().
+    
+    Args:
+        tamanho (int, optional): Tamanho do tabuleiro. Padrao eh 10.
+    
+    Returns:
+        tuple: Layout sorteado
+    """
+    tabuleiro = TabuleiroEsparso(tamanho)
+    posicionar_frota_aleatoria(tabuleiro, criar_frota_padrao())
+    return tuple(navio.inicio + (navio.orientacao,) for navio in tabuleiro.navios)
+
+def aplicar_layout(tabuleiro, layout):
+    """
+    Posiciona a frota padrao em um tabuleiro seguindo um layout.
+    
+    Args:
+        tabuleiro (Tabuleiro): Tabuleiro vazio
+        layout (tuple): Layout com (linha, coluna, orientacao) de cada navio
+    
+    Returns:
+        bool: True se todos os navios foram posicionados, False caso contrario
+            (inclusive se o layout nao tiver um navio para cada navio da frota)
+    """
+    frota = criar_frota_padrao()
+    if len(layout) != len(frota):
+        return False
+    for navio, (linha, coluna, orientacao) in zip(frota, layout):
+        if not tabuleiro.adicionar_navio(navio, linha, coluna, orientacao):
+            return False
+    return True
+
+def transformar_layout(layout, tamanho, transformacao):
+    """
+    Aplica uma das 8 simetrias do tabuleiro (rotacoes e reflexoes) a um layout.
+    
+    Args:
+        layout (tuple): Layout original
+        tamanho (int): Tamanho do tabuleiro
+        transformacao (int): Simetria a aplicar, de 0 (identidade) a 7
+    
+    Returns:
+        tuple: Layout transformado
+    """
+    ultimo = tamanho - 1
+    simetrias = (
+        lambda l, c: (l, c),
+        lambda l, c: (c, ultimo - l),
+        lambda l, c: (ultimo - l, ultimo - c),
+        lambda l, c: (ultimo - c, l),
+        lambda l, c: (l, ultimo - c),
+        lambda l, c: (ultimo - l, c),
+        lambda l, c: (c, l),
+        lambda l, c: (ultimo - c, ultimo - l),
+    )
+    simetria = simetrias[transformacao]
+    
+    novo_layout = []
+    for navio, (linha, coluna, orientacao) in zip(criar_frota_padrao(), layout):
+        if orientacao == 'horizontal':
+            celulas = [simetria(linha, coluna + i) for i in range(navio.tamanho)]
+        else:
+            celulas = [simetria(linha + i, coluna) for i in range(navio.tamanho)]
+        inicio = min(celulas)
+        nova_orientacao = 'vertical' if len({l for l, _ in celulas}) > 1 else 'horizontal'
+        novo_layout.append(inicio + (nova_orientacao,))
+    return tuple(novo_layout)
+
+def mutar_layout(layout, tamanho=10):
+    """
+    Gera um layout vizinho reposicionando um navio aleatorio.
+    
+    Args:
+        layout (tuple): Layout original
+        tamanho (int, optional): Tamanho do tabuleiro. Padrao eh 10.
+    
+    Returns:
+        tuple: Layout com um navio em outra posicao
+    """
+    indice = random.randrange(len(layout))
+    while True:
+        tabuleiro = TabuleiroEsparso(tamanho)
+        navios = criar_frota_padrao()
+        for i, (navio, (linha, coluna, orientacao)) in enumerate(zip(navios, layout)):
+            if i != indice:
+                tabuleiro.adicionar_navio(navio, linha, coluna, orientacao)
+        posicionar_frota_aleatoria(tabuleiro, [navios[indice]])
+        
+        novo_layout = list(layout)
+        novo_layout[indice] = navios[indice].inicio + (navios[indice].orientacao,)
+        if tuple(novo_layout) != layout:
+            return tuple(novo_layout)
+
+def avaliar_layout(layout, atiradores, partidas=20, tamanho=10, semente=None):
+    """
+    Estima quantos tiros os atiradores precisam para afundar um layout.
+    
+    Com semente, a avaliacao usa o gerador global e devolve o estado dele ao
+    final, para nao mudar a sequencia de quem chamou (a busca, quando avalia
+    no proprio processo).
+    
+    Args:
+        layout (tuple): Layout avaliado
+        atiradores (list): Fabricas de estrategias de tiro (por exemplo, as proprias classes)
+        partidas (int, optional): Partidas simuladas por atirador. Padrao eh 20.
+        tamanho (int, optional): Tamanho do tabuleiro. Padrao eh 10.
+        semente (int, optional): Semente do gerador aleatorio. Padrao eh None.
+    
+    Returns:
+        float: Media de tiros para afundar a frota, considerando todos os atiradores
+    """
+    estado = None
+    if semente is not None:
+        estado = random.getstate()
+        random.seed(semente)
+    
+    try:
+        total = 0
+        for fabrica_estrategia in atiradores:
+            for _ in range(partidas):
+                tabuleiro = TabuleiroEsparso(tamanho)
+                aplicar_layout(tabuleiro, layout)
+                total += simular_partida(fabrica_estrategia(), tabuleiro)
+        return total / (partidas * len(atiradores))
+    finally:
+        if estado is not None:
+            random.setstate(estado)
+
+def _avaliar_candidato(argumentos):
+    """
+    Avalia um layout em um processo trabalhador.
+    
+    Args:
+        argumentos (tuple): Argumentos de avaliar_layout
+    
+    Returns:
+        tuple: (float, tuple) - Pontuacao e layout avaliado
+    """
+    layout = argumentos[0]
+    return avaliar_layout(*argumentos), layout
+
+def otimizar_layouts(atiradores=(EstrategiaCacaAlvo,), candidatos=200, geracoes=5, manter=20,
+                     partidas=20, partidas_validacao=200, tamanho=10, processos=None, semente=None):
+    """
+    Busca layouts que maximizam os tiros necessarios para serem afundados.
+    
+    Cada geracao avalia os candidatos em paralelo por simulacao, mantem os
+    melhores e completa a proxima geracao com mutacoes deles. Os layouts que
+    sobrevivem sao reavaliados a cada geracao e acumulam as partidas, entao a
+    pontuacao final deles eh a media de todas as avaliacoes e nao so de uma
+    rodada de sorte.
+    
+    Args:
+        atiradores (tuple, optional): Fabricas das estrategias de tiro usadas na avaliacao.
+            Precisam poder ser enviadas a outros processos (classes ou funcoes de modulo).
+            Padrao eh (EstrategiaCacaAlvo,).
+        candidatos (int, optional): Layouts avaliados por geracao. Padrao eh 200.
+        geracoes (int, optional): Quantidade de geracoes. Padrao eh 5.
+        manter (int, optional): Layouts mantidos entre geracoes e retornados. Padrao eh 20.
+        partidas (int, optional): Partidas simuladas por atirador e layout em cada geracao. Padrao eh 20.
+        partidas_validacao (int, optional): Partidas por atirador na reavaliacao final dos
+            layouts mantidos. Padrao eh 200.
+        tamanho (int, optional): Tamanho do tabuleiro. Padrao eh 10.
+        processos (int, optional): Processos trabalhadores; 1 avalia no proprio processo.
+            Padrao eh None (um por CPU).
+        semente (int, optional): Semente do gerador aleatorio. Padrao eh None.
+    
+    Returns:
+        list: Lista de tuplas (pontuacao, layout), da maior para a menor pontuacao
+    
+    Raises:
+        ValueError: Se geracoes for menor que 1
+    """
+    if geracoes < 1:
+        raise ValueError("A busca precisa de pelo menos uma geracao.")
+    if semente is not None:
+        random.seed(semente)
+    
+    populacao = [sortear_layout(tamanho) for _ in range(candidatos)]
+    acumulado = {}  # layout -> (soma das pontuacoes, avaliacoes)
+    melhores = []
+    executor = ProcessPoolExecutor(processos) if processos != 1 else None
+    try:
+        for _ in range(geracoes):
+            tarefas = [(layout, list(atiradores), partidas, tamanho, random.randrange(2 ** 32))
+                       for layout in populacao]
+            if executor is None:
+                avaliados = map(_avaliar_candidato, tarefas)
+            else:
+                avaliados = executor.map(_avaliar_candidato, tarefas, chunksize=max(1, len(tarefas) // 32))
+            
+            for pontuacao, layout in avaliados:
+                soma, avaliacoes = acumulado.get(layout, (0.0, 0))
+                acumulado[layout] = (soma + pontuacao, avaliacoes + 1)
+            
+            melhores = sorted(((acumulado[layout][0] / acumulado[layout][1], layout) for layout in set(populacao)),
+                              reverse=True)[:manter]
+            
+            sobreviventes = [layout for _, layout in melhores]
+            populacao = sobreviventes + [mutar_layout(random.choice(sobreviventes), tamanho)
+                                         for _ in range(candidatos - len(sobreviventes))]
+        
+        # Reavalia os finalistas com mais partidas: a ordem da busca favorece
+        # layouts que tiveram sorte em poucas avaliacoes
+        tarefas = [(layout, list(atiradores), partidas_validacao, tamanho, random.randrange(2 ** 32))
+                   for _, layout in melhores]
+        if executor is None:
+            melhores = list(map(_avaliar_candidato, tarefas))
+        else:
+            melhores = list(executor.map(_avaliar_candidato, tarefas))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    melhores.sort(reverse=True)
+    return melhores
+
+class PoolLayouts:
+    """
+    Pool de layouts fortes calculados previamente.
+    
+    Escolher um layout no inicio da partida custa apenas um sorteio e uma
+    simetria aleatoria do tabuleiro, para o layout nao se repetir sempre igual.
+    """
+    
+    def __init__(self, layouts, tamanho=10):
+        """
+        Inicializa o pool.
+        
+        Args:
+            layouts (list): Lista de tuplas (pontuacao, layout)
+            tamanho (int, optional): Tamanho do tabuleiro dos layouts. Padrao eh 10.
+        """
+        self.__layouts = list(layouts)
+        self.__tamanho = tamanho
+    
+    @property
+    def tamanho(self):
+        """Retorna o tamanho do tabuleiro dos layouts."""
+        return self.__tamanho
+    
+    @property
+    def layouts(self):
+        """Retorna os layouts do pool com as suas pontuacoes."""
+        return self.__layouts
+    
+    def escolher(self):
+        """
+        Escolhe um layout do pool.
+        
+        Returns:
+            tuple: Layout escolhido, ja com uma simetria aleatoria aplicada
+        """
+        _, layout = random.choice(self.__layouts)
+        return transformar_layout(layout, self.__tamanho, random.randrange(8))
+    
+    def salvar(self, caminho):
+        """
+        Salva o pool em um arquivo JSON.
+        
+        Args:
+            caminho (str): Caminho do arquivo
+        """
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump({'tamanho': self.__tamanho,
+                       'layouts': [[pontuacao, [list(navio) for navio in layout]]
+                                   for pontuacao, layout in self.__layouts]}, arquivo)
+    
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Carrega um pool salvo em JSON.
+        
+        Args:
+            caminho (str): Caminho do arquivo
+        
+        Returns:
+            PoolLayouts: Pool carregado
+        
+        Raises:
+            ValueError: Se o arquivo estiver malformado ou nao contiver layouts validos
+        """
+        with open(caminho, encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+        if not isinstance(dados, dict):
+            raise ValueError(f"Arquivo de layouts malformado: {caminho}")
+        tamanho = dados.get('tamanho', 10)
+        if not _eh_inteiro(tamanho) or tamanho < 1:
+            raise ValueError(f"Tamanho invalido em {caminho}: {tamanho}")
+        
+        layouts = []
+        for entrada in dados.get('layouts', []):
+            if not (isinstance(entrada, list) and len(entrada) == 2 and isinstance(entrada[0], (int, float))):
+                raise ValueError(f"Entrada de layout malformada em {caminho}: {entrada}")
+            layouts.append((entrada[0], _ler_layout(entrada[1], caminho)))
+        
+        # Descarta layouts que nao cabem no tabuleiro
+        layouts = [(pontuacao, layout) for pontuacao, layout in layouts
+                   if aplicar_layout(TabuleiroEsparso(tamanho), layout)]
+        if not layouts:
+            raise ValueError(f"Nenhum layout valido em {caminho}")
+        return cls(layouts, tamanho)
+
+def _eh_inteiro(valor):
+    """
+    Verifica se um valor lido do JSON eh um inteiro (bool nao conta).
+    
+    Args:
+        valor: Valor lido
+    
+    Returns:
+        bool: True se o valor eh um int, False caso contrario
+    """
+    return isinstance(valor, int) and not isinstance(valor, bool)
+
+def _ler_layout(layout, caminho):
+    """
+    Converte um layout lido do JSON, conferindo a estrutura.
+    
+    Args:
+        layout: Layout lido do arquivo
+        caminho (str): Caminho do arquivo, para a mensagem de erro
+    
+    Returns:
+        tuple: Layout com (linha, coluna, orientacao) de cada navio da frota padrao
+    
+    Raises:
+        ValueError: Se o layout nao tiver um navio por navio da frota padrao ou
+            algum navio nao for (int, int, 'horizontal' | 'vertical')
+    """
+    if not isinstance(layout, list) or len(layout) != len(criar_frota_padrao()):
+        raise ValueError(f"Layout malformado em {caminho}: {layout}")
+    for navio in layout:
+        if not (isinstance(navio, list) and len(navio) == 3 and _eh_inteiro(navio[0]) and _eh_inteiro(navio[1])
+                and navio[2] in ('horizontal', 'vertical')):
+            raise ValueError(f"Navio malformado em {caminho}: {navio}")
+    return tuple(tuple(navio) for navio in layout)
+
+# Gera o pool de layouts usado pela IA
+if __name__ == "__main__":
+    melhores = otimizar_layouts()
+    PoolLayouts(melhores).salvar(ARQUIVO_LAYOUTS)
+    print(f"{len(melhores)} layouts salvos em {os.path.abspath(ARQUIVO_LAYOUTS)}")
+    print(f"Media de tiros para afundar o melhor layout: {melhores[0][0]:.2f}")
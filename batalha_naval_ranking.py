@@ -0,0 +1,280 @@
+import json
+import math
+import os
+import random
+import sys
+from batalha_naval_simulacao import simular_duelo
+
+# Constantes do sistema Glicko
+Q = math.log(10) / 400
+Q2 = Q * Q
+PI2 = math.pi * math.pi
+
+class SistemaGlicko:
+    """
+    Ratings Glicko das estrategias de IA, atualizados a cada partida.
+    
+    Cada jogador tem um rating e um desvio (RD) que mede a incerteza do
+    rating; cada resultado atualiza os dois jogadores em O(1). O intervalo
+    rating +- z * RD diz quando ja houve partidas suficientes para separar
+    os jogadores.
+    
+    Os resultados sao agrupados em periodos de `partidas_por_periodo`
+    partidas. Como no Glicko, o RD de um jogador cresce para
+    min(sqrt(RD^2 + c^2 * t), rd_inicial) depois de t periodos, entao ele nao
+    encolhe sem limite e um rating antigo volta a ser incerto.
+    """
+    
+    def __init__(self, rating_inicial=1500.0, rd_inicial=350.0, c=10.0, partidas_por_periodo=100):
+        """
+        Inicializa um sistema sem jogadores.
+        
+        Args:
+            rating_inicial (float, optional): Rating de um jogador novo. Padrao eh 1500.
+            rd_inicial (float, optional): Desvio de um jogador novo. Padrao eh 350.
+            c (float, optional): Crescimento do RD por periodo. Padrao eh 10.
+            partidas_por_periodo (int, optional): Partidas em cada periodo. Padrao eh 100.
+        
+        Raises:
+            ValueError: Se partidas_por_periodo for menor que 1
+        """
+        if partidas_por_periodo < 1:
+            raise ValueError("Um periodo precisa de pelo menos uma partida.")
+        self.__rating_inicial = rating_inicial
+        self.__rd_inicial = rd_inicial
+        self.__c2 = c * c
+        self.__partidas_por_periodo = partidas_por_periodo
+        self.__jogadores = {}  # nome -> [rating, rd, partidas, periodo do rd]
+        self.__partidas = 0
+    
+    @property
+    def partidas(self):
+        """Retorna a quantidade de resultados processados."""
+        return self.__partidas
+    
+    def __rd_atual(self, valores):
+        """
+        Calcula o RD de um jogador no periodo atual.
+        
+        Args:
+            valores (list): [rating, rd, partidas, periodo do rd] do jogador
+        
+        Returns:
+            float: RD acrescido dos periodos passados desde o ultimo calculo
+        """
+        periodos = self.__partidas // self.__partidas_por_periodo - valores[3]
+        if periodos <= 0:
+            return valores[1]
+        return min(math.sqrt(valores[1] * valores[1] + self.__c2 * periodos), self.__rd_inicial)
+    
+    def registrar_partida(self, jogador_a, jogador_b, resultado):
+        """
+        Atualiza os ratings com o resultado de uma partida.
+        
+        Args:
+            jogador_a (str): Nome do primeiro jogador
+            jogador_b (str): Nome do segundo jogador
+            resultado (float): 1 se o primeiro venceu, 0 se perdeu, 0.5 em caso de empate
+        """
+        jogadores = self.__jogadores
+        periodo = self.__partidas // self.__partidas_por_periodo
+        a = jogadores.get(jogador_a)
+        if a is None:
+            a = jogadores[jogador_a] = [self.__rating_inicial, self.__rd_inicial, 0, periodo]
+        b = jogadores.get(jogador_b)
+        if b is None:
+            b = jogadores[jogador_b] = [self.__rating_inicial, self.__rd_inicial, 0, periodo]
+        
+        # Os dois lados usam os valores anteriores a partida, com o RD do periodo atual
+        rating_a, rd_a = a[0], self.__rd_atual(a)
+        rating_b, rd_b = b[0], self.__rd_atual(b)
+        g_a = 1 / math.sqrt(1 + 3 * Q2 * rd_a * rd_a / PI2)
+        g_b = 1 / math.sqrt(1 + 3 * Q2 * rd_b * rd_b / PI2)
+        esperado_a = 1 / (1 + math.exp(-g_b * (rating_a - rating_b) * Q))
+        esperado_b = 1 / (1 + math.exp(-g_a * (rating_b - rating_a) * Q))
+        
+        precisao_a = 1 / (rd_a * rd_a) + Q2 * g_b * g_b * esperado_a * (1 - esperado_a)
+        precisao_b = 1 / (rd_b * rd_b) + Q2 * g_a * g_a * esperado_b * (1 - esperado_b)
+        a[0] = rating_a + Q / precisao_a * g_b * (resultado - esperado_a)
+        b[0] = rating_b + Q / precisao_b * g_a * ((1 - resultado) - esperado_b)
+        a[1] = 1 / math.sqrt(precisao_a)
+        b[1] = 1 / math.sqrt(precisao_b)
+        a[2] += 1
+        b[2] += 1
+        a[3] = b[3] = periodo
+        self.__partidas += 1
+    
+    def processar(self, resultados):
+        """
+        Processa um fluxo de resultados.
+        
+        Args:
+            resultados (iterable): Tuplas (jogador_a, jogador_b, resultado)
+        """
+        registrar = self.registrar_partida
+        for jogador_a, jogador_b, resultado in resultados:
+            registrar(jogador_a, jogador_b, resultado)
+    
+    def rating(self, jogador):
+        """
+        Retorna o rating de um jogador.
+        
+        Args:
+            jogador (str): Nome do jogador
+        
+        Returns:
+            float: Rating do jogador
+        """
+        return self.__jogadores.get(jogador, [self.__rating_inicial])[0]
+    
+    def intervalo(self, jogador, z=1.96):
+        """
+        Retorna o intervalo de confianca do rating de um jogador.
+        
+        Args:
+            jogador (str): Nome do jogador
+            z (float, optional): Quantos desvios de cada lado. Padrao eh 1.96 (95%).
+        
+        Returns:
+            tuple: (float, float) - Limites inferior e superior do rating
+        """
+        valores = self.__jogadores.get(jogador)
+        if valores is None:
+            return (self.__rating_inicial - z * self.__rd_inicial, self.__rating_inicial + z * self.__rd_inicial)
+        rating, rd = valores[0], self.__rd_atual(valores)
+        return (rating - z * rd, rating + z * rd)
+    
+    def ranking(self):
+        """
+        Monta a tabela de classificacao.
+        
+        Returns:
+            list: Tuplas (nome, rating, rd, partidas), do maior para o menor rating,
+                com o RD do periodo atual
+        """
+        return sorted(((nome, valores[0], self.__rd_atual(valores), valores[2])
+                       for nome, valores in self.__jogadores.items()),
+                      key=lambda linha: linha[1], reverse=True)
+    
+    def lider_definido(self, z=1.96):
+        """
+        Verifica se o lider esta separado de todos os outros com a confianca dada.
+        
+        Serve para encerrar um torneio mais cedo: quando o limite inferior do
+        lider passa o limite superior de todos os outros, mais partidas nao
+        mudam o primeiro lugar.
+        
+        Args:
+            z (float, optional): Quantos desvios de cada lado. Padrao eh 1.96 (95%).
+        
+        Returns:
+            bool: True se o lider esta definido, False caso contrario
+        """
+        tabela = self.ranking()
+        if len(tabela) < 2:
+            return False
+        _, rating_lider, rd_lider, _ = tabela[0]
+        return all(rating_lider - z * rd_lider > rating + z * rd for _, rating, rd, _ in tabela[1:])
+    
+    def salvar(self, caminho):
+        """
+        Grava um checkpoint do sistema em JSON, substituindo o arquivo de forma atomica.
+        
+        Args:
+            caminho (str): Caminho do arquivo
+        """
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump({'rating_inicial': self.__rating_inicial,
+                       'rd_inicial': self.__rd_inicial,
+                       'c': math.sqrt(self.__c2),
+                       'partidas_por_periodo': self.__partidas_por_periodo,
+                       'partidas': self.__partidas,
+                       'jogadores': self.__jogadores}, arquivo)
+        os.replace(temporario, caminho)
+    
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Carrega um checkpoint gravado por salvar().
+        
+        Args:
+            caminho (str): Caminho do arquivo
+        
+        Returns:
+            SistemaGlicko: Sistema restaurado
+        """
+        with open(caminho, encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+        sistema = cls(dados['rating_inicial'], dados['rd_inicial'],
+                      dados.get('c', 10.0), dados.get('partidas_por_periodo', 100))
+        sistema.__partidas = dados['partidas']
+        # Checkpoints sem o periodo do RD contam a partir do periodo atual
+        periodo = sistema.__partidas // sistema.__partidas_por_periodo
+        sistema.__jogadores = {nome: (list(valores) + [periodo])[:4] for nome, valores in dados['jogadores'].items()}
+        return sistema
+
+def ler_resultados(caminho, pular=0):
+    """
+    Le um arquivo de resultados, uma partida por linha no formato "jogador_a,jogador_b,resultado".
+    
+    Args:
+        caminho (str): Caminho do arquivo
+        pular (int, optional): Resultados iniciais a ignorar, por exemplo os ja
+            contados em um checkpoint. Padrao eh 0.
+    
+    Yields:
+        tuple: (str, str, float) - Jogadores e resultado do primeiro jogador
+    """
+    with open(caminho, encoding='utf-8') as arquivo:
+        for numero, linha in enumerate(arquivo):
+            if numero < pular or not linha.strip():
+                continue
+            jogador_a, jogador_b, resultado = linha.rstrip('\n').rsplit(',', 2)
+            yield jogador_a, jogador_b, float(resultado)
+
+def torneio(fabricas, sistema=None, maximo_partidas=10000, verificar_a_cada=100, tamanho=10, z=1.96):
+    """
+    Joga duelos entre pares aleatorios de estrategias ate o lider ficar definido.
+    
+    Args:
+        fabricas (dict | list): Dicionario nome -> fabrica, ou lista de fabricas
+            (os nomes no ranking sao entao os __name__ delas)
+        sistema (SistemaGlicko, optional): Sistema a atualizar. Padrao eh um sistema novo.
+        maximo_partidas (int, optional): Limite de partidas. Padrao eh 10000.
+        verificar_a_cada (int, optional): Partidas entre as verificacoes de parada. Padrao eh 100.
+        tamanho (int, optional): Tamanho dos tabuleiros. Padrao eh 10.
+        z (float, optional): Confianca exigida para o lider. Padrao eh 1.96 (95%).
+    
+    Returns:
+        SistemaGlicko: Sistema com os ratings do torneio
+    
+    Raises:
+        ValueError: Se houver menos de duas fabricas ou nomes repetidos
+    """
+    if isinstance(fabricas, dict):
+        participantes = list(fabricas.items())
+    else:
+        participantes = [(getattr(fabrica, '__name__', str(fabrica)), fabrica) for fabrica in fabricas]
+    if len(participantes) < 2:
+        raise ValueError("Um torneio precisa de pelo menos duas estrategias.")
+    nomes = [nome for nome, _ in participantes]
+    if len(set(nomes)) != len(nomes):
+        raise ValueError(f"Estrategias com o mesmo nome: {nomes}. Passe um dicionario nome -> fabrica.")
+    
+    sistema = sistema if sistema is not None else SistemaGlicko()
+    for partida in range(1, maximo_partidas + 1):
+        (nome_0, fabrica_0), (nome_1, fabrica_1) = random.sample(participantes, 2)
+        gravacao = simular_duelo(fabrica_0, fabrica_1, tamanho)
+        sistema.registrar_partida(nome_0, nome_1, 1.0 if gravacao.vencedor == 0 else 0.0)
+        if partida % verificar_a_cada == 0 and sistema.lider_definido(z):
+            break
+    return sistema
+
+# Monta o ranking a partir de um arquivo de resultados
+if __name__ == "__main__":
+    sistema = SistemaGlicko()
+    sistema.processar(ler_resultados(sys.argv[1]))
+    print(f"{sistema.partidas} partidas")
+    for posicao, (nome, rating, rd, partidas) in enumerate(sistema.ranking(), 1):
+        print(f"{posicao}. {nome}: {rating:.0f} +- {1.96 * rd:.0f} ({partidas} partidas)")
@@ -0,0 +1,388 @@
+import json
+
+class GravacaoPartida:
+    """
+    Gravacao compacta de uma partida: o posicionamento das frotas dos dois
+    jogadores e a sequencia de tiros.
+    
+    Os navios de cada tabuleiro sao guardados como (tamanho, linha, coluna,
+    orientacao) e cada tiro como (atirador, linha, coluna), onde atirador eh
+    o indice do jogador que atirou (0 ou 1) no tabuleiro do outro.
+    """
+    
+    def __init__(self, tamanho, navios, nomes=("Jogador", "Computador")):
+        """
+        Inicializa uma gravacao sem tiros.
+        
+        Args:
+            tamanho (int): Tamanho dos tabuleiros
+            navios (tuple): Para cada jogador, a lista de navios (tamanho, linha, coluna, orientacao)
+            nomes (tuple, optional): Nomes dos jogadores. Padrao eh ("Jogador", "Computador").
+        """
+        self.__tamanho = tamanho
+        self.__navios = tuple(tuple(tuple(navio) for navio in frota) for frota in navios)
+        self.__nomes = tuple(nomes)
+        self.__tiros = []
+        self.__vencedor = None
+    
+    @classmethod
+    def de_tabuleiros(cls, tabuleiro_0, tabuleiro_1, nomes=("Jogador", "Computador")):
+        """
+        Cria uma gravacao a partir dos tabuleiros com as frotas posicionadas.
+        
+        Args:
+            tabuleiro_0 (Tabuleiro): Tabuleiro do jogador 0
+            tabuleiro_1 (Tabuleiro): Tabuleiro do jogador 1
+            nomes (tuple, optional): Nomes dos jogadores. Padrao eh ("Jogador", "Computador").
+        
+        Returns:
+            GravacaoPartida: Gravacao sem tiros
+        """
+        navios = []
+        for tabuleiro in (tabuleiro_0, tabuleiro_1):
+            navios.append([(navio.tamanho,) + navio.celulas()[0] + (navio.orientacao,)
+                           for navio in tabuleiro.navios])
+        return cls(tabuleiro_0.tamanho, navios, nomes)
+    
+    @property
+    def tamanho(self):
+        """Retorna o tamanho dos tabuleiros."""
+        return self.__tamanho
+    
+    @property
+    def navios(self):
+        """Retorna os navios de cada jogador como (tamanho, linha, coluna, orientacao)."""
+        return self.__navios
+    
+    @property
+    def nomes(self):
+        """Retorna os nomes dos jogadores."""
+        return self.__nomes
+    
+    @property
+    def tiros(self):
+        """Retorna a sequencia de tiros como (atirador, linha, coluna)."""
+        return self.__tiros
+    
+    @property
+    def vencedor(self):
+        """Retorna o indice do jogador vencedor, ou None se a partida nao terminou."""
+        return self.__vencedor
+    
+    @vencedor.setter
+    def vencedor(self, valor):
+        """Define o indice do jogador vencedor."""
+        self.__vencedor = valor
+    
+    def registrar_tiro(self, atirador, linha, coluna):
+        """
+        Acrescenta um tiro a gravacao.
+        
+        Args:
+            atirador (int): Indice do jogador que atirou (0 ou 1)
+            linha (int): Linha do tiro
+            coluna (int): Coluna do tiro
+        """
+        self.__tiros.append((atirador, linha, coluna))
+    
+    def para_dict(self):
+        """
+        Converte a gravacao em um dicionario serializavel em JSON.
+        
+        Returns:
+            dict: Dados da gravacao
+        """
+        return {
+            'tamanho': self.__tamanho,
+            'nomes': list(self.__nomes),
+            'navios': [[list(navio) for navio in frota] for frota in self.__navios],
+            'tiros': [list(tiro) for tiro in self.__tiros],
+            'vencedor': self.__vencedor,
+        }
+    
+    @classmethod
+    def de_dict(cls, dados):
+        """
+        Recria uma gravacao a partir de um dicionario.
+        
+        Args:
+            dados (dict): Dados gerados por para_dict()
+        
+        Returns:
+            GravacaoPartida: Gravacao recriada
+        """
+        gravacao = cls(dados['tamanho'], dados['navios'], dados.get('nomes', ("Jogador", "Computador")))
+        for atirador, linha, coluna in dados['tiros']:
+            gravacao.registrar_tiro(atirador, linha, coluna)
+        gravacao.vencedor = dados.get('vencedor')
+        return gravacao
+    
+    def salvar(self, caminho):
+        """
+        Salva a gravacao em um arquivo JSON.
+        
+        Args:
+            caminho (str): Caminho do arquivo
+        """
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(self.para_dict(), arquivo)
+    
+    @classmethod
+    def carregar(cls, caminho):
+        """
+        Carrega uma gravacao salva em JSON.
+        
+        Args:
+            caminho (str): Caminho do arquivo
+        
+        Returns:
+            GravacaoPartida: Gravacao carregada
+        """
+        with open(caminho, encoding='utf-8') as arquivo:
+            return cls.de_dict(json.load(arquivo))
+
+def mascaras_navios(tamanho, navios):
+    """
+    Converte navios (tamanho, linha, coluna, orientacao) em bitmasks de celulas.
+    
+    Args:
+        tamanho (int): Tamanho do tabuleiro
+        navios (list): Navios do tabuleiro
+    
+    Returns:
+        list: Uma bitmask por navio (indice do bit = linha * tamanho + coluna)
+    """
+    mascaras = []
+    for tamanho_navio, linha, coluna, orientacao in navios:
+        passo = 1 if orientacao == 'horizontal' else tamanho
+        inicio = linha * tamanho + coluna
+        mascara = 0
+        for i in range(tamanho_navio):
+            mascara |= 1 << (inicio + i * passo)
+        mascaras.append(mascara)
+    return mascaras
+
+class EstadoReplay:
+    """
+    Estado dos dois tabuleiros em um turno da partida.
+    
+    Guarda apenas os tiros recebidos por cada tabuleiro em bitmasks; acertos
+    e navios afundados sao calculados a partir das mascaras dos navios.
+    """
+    
+    def __init__(self, replay, turno, tiros):
+        """
+        Inicializa o estado.
+        
+        Args:
+            replay (Replay): Replay de origem
+            turno (int): Quantidade de tiros ja disparados
+            tiros (tuple): Bitmasks dos tiros recebidos pelos tabuleiros 0 e 1
+        """
+        self.__replay = replay
+        self.__turno = turno
+        self.__tiros = tiros
+    
+    @property
+    def turno(self):
+        """Retorna a quantidade de tiros ja disparados."""
+        return self.__turno
+    
+    @property
+    def tiros(self):
+        """Retorna as bitmasks dos tiros recebidos pelos tabuleiros 0 e 1."""
+        return self.__tiros
+    
+    def acertos(self, jogador):
+        """
+        Retorna a bitmask dos acertos recebidos pelo tabuleiro de um jogador.
+        
+        Args:
+            jogador (int): Indice do dono do tabuleiro
+        
+        Returns:
+            int: Bitmask das celulas com navio atingido
+        """
+        return self.__tiros[jogador] & self.__replay.ocupacao(jogador)
+    
+    def navios_afundados(self, jogador):
+        """
+        Lista os navios afundados no tabuleiro de um jogador.
+        
+        Args:
+            jogador (int): Indice do dono do tabuleiro
+        
+        Returns:
+            list: Indices dos navios afundados, na ordem da gravacao
+        """
+        tiros = self.__tiros[jogador]
+        return [i for i, mascara in enumerate(self.__replay.mascaras(jogador)) if tiros & mascara == mascara]
+    
+    def renderizar(self, jogador, mostrar_navios=True):
+        """
+        Desenha o tabuleiro de um jogador com a legenda do jogo.
+        
+        Args:
+            jogador (int): Indice do dono do tabuleiro
+            mostrar_navios (bool, optional): Se True, mostra os navios nao atingidos. Padrao eh True.
+        
+        Returns:
+            str: Tabuleiro desenhado, uma linha de texto por linha do tabuleiro
+        """
+        tamanho = self.__replay.gravacao.tamanho
+        tiros = _bits_por_celula(self.__tiros[jogador], tamanho)
+        ocupacao = _bits_por_celula(self.__replay.ocupacao(jogador), tamanho)
+        
+        linhas = ["  " + "".join(f" {j} " for j in range(tamanho))]
+        for i in range(tamanho):
+            celulas = []
+            for indice in range(i * tamanho, (i + 1) * tamanho):
+                if tiros[indice] == '1':
+                    celulas.append(" X " if ocupacao[indice] == '1' else " O ")
+                elif mostrar_navios and ocupacao[indice] == '1':
+                    celulas.append(" N ")
+                else:
+                    celulas.append(" ~ ")
+            linhas.append(f"{i} " + "".join(celulas))
+        return "\n".join(linhas)
+
+def _bits_por_celula(mascara, tamanho):
+    """
+    Converte uma bitmask em uma string com um caractere '0'/'1' por celula.
+    
+    Testar `mascara & (1 << indice)` celula a celula custa O(area) por teste
+    em tabuleiros grandes; a conversao eh feita uma vez so por quadro.
+    
+    Args:
+        mascara (int): Bitmask do tabuleiro
+        tamanho (int): Tamanho do tabuleiro
+    
+    Returns:
+        str: Caractere do bit de cada celula, na ordem dos indices
+    """
+    return format(mascara, f'0{tamanho * tamanho}b')[::-1]
+
+class Replay:
+    """
+    Reconstroi uma partida gravada com acesso rapido a qualquer turno.
+    
+    A cada `intervalo` tiros guarda um quadro-chave com as bitmasks de tiros
+    dos dois tabuleiros; ir para um turno qualquer parte do quadro-chave
+    anterior e aplica no maximo `intervalo - 1` tiros.
+    """
+    
+    def __init__(self, gravacao, intervalo=32):
+        """
+        Prepara o replay de uma gravacao.
+        
+        Args:
+            gravacao (GravacaoPartida): Partida gravada
+            intervalo (int, optional): Tiros entre quadros-chave. Padrao eh 32.
+        """
+        self.__gravacao = gravacao
+        self.__intervalo = intervalo
+        self.__mascaras = [mascaras_navios(gravacao.tamanho, frota) for frota in gravacao.navios]
+        self.__ocupacao = [0, 0]
+        for jogador, mascaras in enumerate(self.__mascaras):
+            for mascara in mascaras:
+                self.__ocupacao[jogador] |= mascara
+        
+        # Cada tiro vira (tabuleiro alvo, bit), e os quadros-chave saem em uma unica passada
+        tamanho = gravacao.tamanho
+        self.__tiros = [(1 - atirador, 1 << (linha * tamanho + coluna))
+                        for atirador, linha, coluna in gravacao.tiros]
+        self.__quadros = []
+        tiros = [0, 0]
+        for turno, (alvo, bit) in enumerate(self.__tiros):
+            if turno % intervalo == 0:
+                self.__quadros.append(tuple(tiros))
+            tiros[alvo] |= bit
+        if len(self.__tiros) % intervalo == 0:
+            self.__quadros.append(tuple(tiros))
+    
+    @property
+    def gravacao(self):
+        """Retorna a gravacao reproduzida."""
+        return self.__gravacao
+    
+    def __len__(self):
+        """Retorna a quantidade de tiros da partida."""
+        return len(self.__tiros)
+    
+    def mascaras(self, jogador):
+        """
+        Retorna as bitmasks dos navios de um jogador.
+        
+        Args:
+            jogador (int): Indice do jogador
+        
+        Returns:
+            list: Uma bitmask por navio
+        """
+        return self.__mascaras[jogador]
+    
+    def ocupacao(self, jogador):
+        """
+        Retorna a bitmask de todas as celulas ocupadas pelos navios de um jogador.
+        
+        Args:
+            jogador (int): Indice do jogador
+        
+        Returns:
+            int: Bitmask das celulas ocupadas
+        """
+        return self.__ocupacao[jogador]
+    
+    def estado(self, turno):
+        """
+        Retorna o estado da partida depois de um numero de tiros.
+        
+        Args:
+            turno (int): Quantidade de tiros disparados, de 0 a len(replay)
+        
+        Returns:
+            EstadoReplay: Estado dos dois tabuleiros
+        
+        Raises:
+            IndexError: Se o turno estiver fora da partida
+        """
+        if not 0 <= turno <= len(self.__tiros):
+            raise IndexError(f"Turno {turno} fora da partida (0 a {len(self.__tiros)})")
+        
+        quadro = turno // self.__intervalo
+        tiros = list(self.__quadros[quadro])
+        for alvo, bit in self.__tiros[quadro * self.__intervalo:turno]:
+            tiros[alvo] |= bit
+        return EstadoReplay(self, turno, tuple(tiros))
+    
+    def reproduzir(self, inicio=0, fim=None, passo=1):
+        """
+        Percorre os estados da partida em sequencia, sem voltar aos quadros-chave.
+        
+        O estado de fim eh sempre o ultimo, mesmo que fim - inicio nao seja
+        multiplo do passo.
+        
+        Args:
+            inicio (int, optional): Primeiro turno. Padrao eh 0.
+            fim (int, optional): Ultimo turno, inclusive. Padrao eh o fim da partida.
+            passo (int, optional): Tiros aplicados entre estados. Padrao eh 1.
+        
+        Yields:
+            EstadoReplay: Estado em cada turno percorrido
+        """
+        fim = len(self.__tiros) if fim is None else min(fim, len(self.__tiros))
+        estado = self.estado(inicio)
+        tiros = list(estado.tiros)
+        yield estado
+        
+        ultimo = inicio
+        for turno in range(inicio + passo, fim + 1, passo):
+            for alvo, bit in self.__tiros[turno - passo:turno]:
+                tiros[alvo] |= bit
+            yield EstadoReplay(self, turno, tuple(tiros))
+            ultimo = turno
+        
+        if ultimo < fim:
+            for alvo, bit in self.__tiros[ultimo:fim]:
+                tiros[alvo] |= bit
+            yield EstadoReplay(self, fim, tuple(tiros))
@@ -0,0 +1,482 @@
+import asyncio
+import itertools
+import json
+from batalha_naval_classes import criar_frota_padrao, posicionar_frota_aleatoria
+from batalha_naval_jogadores import JogadorHumano, JogadorIA
+from batalha_naval_posicionamento import aplicar_layout
+from batalha_naval_replay import GravacaoPartida
+
+class SessaoJogo:
+    """
+    Partida de um jogador contra a IA, sem interface.
+    
+    Segue o mesmo fluxo do Jogo: o jogador posiciona a frota navio a navio
+    e cada tiro dele eh respondido imediatamente por um tiro da IA. No modo
+    salva, cada turno tem um tiro por navio ainda nao afundado do atirador.
+    
+    Uma sessao em andamento pode ser exportada com para_dict() e recriada
+    em outro processo com de_dict(), que refaz os tiros gravados.
+    """
+    
+    def __init__(self, id_sessao, tamanho=10, esparso=False, salva=False, layout_ia=None):
+        """
+        Inicializa a sessao com a frota da IA ja posicionada.
+        
+        Args:
+            id_sessao (str): Identificador da sessao
+            tamanho (int, optional): Tamanho dos tabuleiros. Padrao eh 10.
+            esparso (bool, optional): Se True, usa TabuleiroEsparso. Padrao eh False.
+            salva (bool, optional): Se True, joga no modo salva. Padrao eh False.
+            layout_ia (list, optional): (linha, coluna, orientacao) de cada navio da IA.
+                Padrao eh None (posicionamento da propria IA).
+        
+        Raises:
+            ValueError: Se o layout da IA for invalido
+        """
+        self.__id = id_sessao
+        self.__esparso = esparso
+        self.__salva = salva
+        self.__jogador_humano = JogadorHumano("Jogador", tamanho, esparso)
+        self.__jogador_ia = JogadorIA("Computador", tamanho, esparso)
+        if layout_ia is None:
+            self.__jogador_ia.inicializar_frota()
+        elif not aplicar_layout(self.__jogador_ia.tabuleiro, layout_ia):
+            raise ValueError("Layout invalido para a frota da IA.")
+        self.__navios_pendentes = criar_frota_padrao()
+        self.__gravacao = None
+        self.__vencedor = None
+    
+    @property
+    def id(self):
+        """Retorna o identificador da sessao."""
+        return self.__id
+    
+    @property
+    def salva(self):
+        """Retorna True se a sessao eh do modo salva."""
+        return self.__salva
+    
+    @property
+    def navios_pendentes(self):
+        """Retorna os navios do jogador que ainda faltam posicionar."""
+        return self.__navios_pendentes
+    
+    @property
+    def gravacao(self):
+        """Retorna a gravacao da partida, ou None enquanto a frota nao foi posicionada."""
+        return self.__gravacao
+    
+    @property
+    def vencedor(self):
+        """Retorna o indice do vencedor (0 jogador, 1 IA), ou None se a partida nao terminou."""
+        return self.__vencedor
+    
+    def posicionar_navio(self, orientacao, linha, coluna):
+        """
+        Posiciona o proximo navio pendente do jogador.
+        
+        Args:
+            orientacao (str): 'horizontal' ou 'vertical'
+            linha (int): Linha inicial do navio
+            coluna (int): Coluna inicial do navio
+        
+        Returns:
+            bool: True se o navio foi posicionado, False se a posicao eh invalida
+        
+        Raises:
+            ValueError: Se todos os navios ja foram posicionados ou a orientacao eh invalida
+        """
+        if not self.__navios_pendentes:
+            raise ValueError("Todos os navios ja foram posicionados.")
+        if orientacao not in ('horizontal', 'vertical'):
+            raise ValueError("Orientacao invalida. Use 'horizontal' ou 'vertical'.")
+        
+        if not self.__jogador_humano.tabuleiro.adicionar_navio(self.__navios_pendentes[0], linha, coluna, orientacao):
+            return False
+        self.__navios_pendentes.pop(0)
+        if not self.__navios_pendentes:
+            self.__iniciar_gravacao()
+        return True
+    
+    def posicionar_aleatoriamente(self):
+        """Posiciona aleatoriamente todos os navios pendentes do jogador."""
+        posicionar_frota_aleatoria(self.__jogador_humano.tabuleiro, self.__navios_pendentes)
+        self.__navios_pendentes = []
+        self.__iniciar_gravacao()
+    
+    def atirar(self, linha, coluna):
+        """
+        Processa o tiro do jogador e, se a partida continuar, a resposta da IA.
+        
+        Args:
+            linha (int): Linha do tiro
+            coluna (int): Coluna do tiro
+        
+        Returns:
+            dict: Resultado do tiro do jogador, o tiro da IA (se houve) e o vencedor
+        
+        Raises:
+            ValueError: Se a sessao eh do modo salva, a frota nao foi posicionada,
+                a partida terminou ou o tiro eh invalido
+        """
+        if self.__salva:
+            raise ValueError("Esta sessao eh do modo salva; use atirar_salva.")
+        self.__validar_tiros([(linha, coluna)])
+        
+        resposta = {}
+        resposta['acertou'], resposta['afundou'] = self.__processar_tiro(0, linha, coluna)
+        if self.__jogador_ia.perdeu():
+            self.__vencedor = 0
+        else:
+            linha_ia, coluna_ia = self.__jogador_ia.fazer_jogada()
+            resposta['tiro_ia'] = [linha_ia, coluna_ia]
+            resposta['ia_acertou'], resposta['ia_afundou'] = self.__processar_tiro(1, linha_ia, coluna_ia)
+            if self.__jogador_humano.perdeu():
+                self.__vencedor = 1
+        
+        self.__gravacao.vencedor = self.__vencedor
+        resposta['vencedor'] = self.__vencedor
+        return resposta
+    
+    def atirar_salva(self, tiros):
+        """
+        Processa a salva do jogador e, se a partida continuar, a salva da IA.
+        
+        Cada salva eh aplicada ao tabuleiro do oponente de uma vez.
+        
+        Args:
+            tiros (list): Coordenadas (linha, coluna) dos tiros, no maximo um por navio
+                do jogador ainda nao afundado
+        
+        Returns:
+            dict: Resultado de cada tiro do jogador, a salva da IA (se houve) e o vencedor
+        
+        Raises:
+            ValueError: Se a sessao nao eh do modo salva, a frota nao foi posicionada,
+                a partida terminou ou a salva eh invalida
+        """
+        if not self.__salva:
+            raise ValueError("Esta sessao nao eh do modo salva; use atirar.")
+        tiros = [(linha, coluna) for linha, coluna in tiros]
+        self.__validar_tiros(tiros)
+        if len(tiros) > self.__jogador_humano.navios_restantes():
+            raise ValueError("A salva tem mais tiros do que navios a flutuar.")
+        if len(set(tiros)) != len(tiros):
+            raise ValueError("A salva tem tiros repetidos.")
+        
+        resposta = {'resultados': self.__processar_salva(0, tiros)}
+        if self.__jogador_ia.perdeu():
+            self.__vencedor = 0
+        else:
+            tiros_ia = self.__jogador_ia.fazer_salva(self.__jogador_ia.navios_restantes())
+            resposta['tiros_ia'] = [[linha, coluna] for linha, coluna in tiros_ia]
+            resposta['resultados_ia'] = self.__processar_salva(1, tiros_ia)
+            if self.__jogador_humano.perdeu():
+                self.__vencedor = 1
+        
+        self.__gravacao.vencedor = self.__vencedor
+        resposta['vencedor'] = self.__vencedor
+        return resposta
+    
+    def para_dict(self):
+        """
+        Tira um snapshot da sessao: as frotas posicionadas e os tiros ja feitos.
+        
+        Returns:
+            dict: Dados da sessao, serializaveis em JSON
+        """
+        frotas = [[list(navio.celulas()[0]) + [navio.orientacao] for navio in jogador.tabuleiro.navios]
+                  for jogador in (self.__jogador_humano, self.__jogador_ia)]
+        return {
+            'id': self.__id,
+            'tamanho': self.__jogador_humano.tabuleiro.tamanho,
+            'esparso': self.__esparso,
+            'salva': self.__salva,
+            'navios_jogador': frotas[0],
+            'navios_ia': frotas[1],
+            'tiros': [list(tiro) for tiro in self.__gravacao.tiros] if self.__gravacao is not None else [],
+        }
+    
+    @classmethod
+    def de_dict(cls, dados):
+        """
+        Recria uma sessao a partir de um snapshot.
+        
+        Os tiros sao refeitos em ordem, entao a IA reconstroi o que sabia do
+        tabuleiro do jogador sem que o estado interno da estrategia precise
+        ser serializado.
+        
+        Args:
+            dados (dict): Dados gerados por para_dict()
+        
+        Returns:
+            SessaoJogo: Sessao no mesmo ponto da partida
+        
+        Raises:
+            ValueError: Se o snapshot for invalido
+        """
+        sessao = cls(dados['id'], dados['tamanho'], dados['esparso'], dados['salva'], dados['navios_ia'])
+        for linha, coluna, orientacao in dados['navios_jogador']:
+            if not sessao.posicionar_navio(orientacao, linha, coluna):
+                raise ValueError("Snapshot invalido: navio do jogador fora de posicao.")
+        
+        for atirador, linha, coluna in dados['tiros']:
+            sessao.__processar_tiro(atirador, linha, coluna)
+        if sessao.__gravacao is not None:
+            if sessao.__jogador_ia.perdeu():
+                sessao.__vencedor = 0
+            elif sessao.__jogador_humano.perdeu():
+                sessao.__vencedor = 1
+            sessao.__gravacao.vencedor = sessao.__vencedor
+        return sessao
+    
+    def __validar_tiros(self, tiros):
+        """
+        Confere se a partida aceita tiros e se cada tiro eh valido.
+        
+        Args:
+            tiros (list): Coordenadas (linha, coluna) dos tiros
+        
+        Raises:
+            ValueError: Se a frota nao foi posicionada, a partida terminou ou um tiro eh invalido
+        """
+        if self.__navios_pendentes:
+            raise ValueError("Posicione todos os navios antes de atirar.")
+        if self.__vencedor is not None:
+            raise ValueError("A partida ja terminou.")
+        if not tiros:
+            raise ValueError("Nenhum tiro informado.")
+        
+        tamanho = self.__jogador_humano.tabuleiro.tamanho
+        for linha, coluna in tiros:
+            if not (0 <= linha < tamanho and 0 <= coluna < tamanho):
+                raise ValueError(f"Coordenadas fora do tabuleiro. Use valores entre 0 e {tamanho - 1}.")
+            if self.__jogador_humano.tabuleiro_oponente.posicao_tem_tiro(linha, coluna):
+                raise ValueError("Voce ja atirou nessa posicao.")
+    
+    def __processar_salva(self, atirador, tiros):
+        """
+        Aplica uma salva no tabuleiro do oponente do atirador.
+        
+        Args:
+            atirador (int): 0 para o jogador, 1 para a IA
+            tiros (list): Coordenadas (linha, coluna) dos tiros
+        
+        Returns:
+            list: Para cada tiro, um dicionario com 'acertou' e 'afundou' (nome do navio ou None)
+        """
+        jogador, oponente = ((self.__jogador_humano, self.__jogador_ia) if atirador == 0
+                             else (self.__jogador_ia, self.__jogador_humano))
+        resultados = []
+        for (linha, coluna), (acertou, navio, afundou) in zip(tiros, oponente.tabuleiro.receber_salva(tiros)):
+            navio_afundado = navio if afundou else None
+            jogador.registrar_resultado_tiro(linha, coluna, acertou, navio_afundado)
+            self.__gravacao.registrar_tiro(atirador, linha, coluna)
+            resultados.append({'acertou': acertou,
+                               'afundou': navio_afundado.nome if navio_afundado is not None else None})
+        return resultados
+    
+    def __processar_tiro(self, atirador, linha, coluna):
+        """
+        Aplica um tiro no tabuleiro do oponente do atirador.
+        
+        Args:
+            atirador (int): 0 para o jogador, 1 para a IA
+            linha (int): Linha do tiro
+            coluna (int): Coluna do tiro
+        
+        Returns:
+            tuple: (bool, str) - Se acertou e o nome do navio afundado, ou None
+        """
+        jogador, oponente = ((self.__jogador_humano, self.__jogador_ia) if atirador == 0
+                             else (self.__jogador_ia, self.__jogador_humano))
+        acertou, navio = oponente.tabuleiro.receber_tiro(linha, coluna)
+        navio_afundado = navio if acertou and navio.esta_afundado() else None
+        jogador.registrar_resultado_tiro(linha, coluna, acertou, navio_afundado)
+        self.__gravacao.registrar_tiro(atirador, linha, coluna)
+        return acertou, navio_afundado.nome if navio_afundado is not None else None
+    
+    def __iniciar_gravacao(self):
+        """Comeca a gravar a partida quando as duas frotas estao posicionadas."""
+        self.__gravacao = GravacaoPartida.de_tabuleiros(
+            self.__jogador_humano.tabuleiro, self.__jogador_ia.tabuleiro,
+            (self.__jogador_humano.nome, self.__jogador_ia.nome))
+
+class ServidorSessoes:
+    """
+    Hospeda varias sessoes de jogo e executa comandos enviados pelos clientes.
+    
+    Os comandos sao dicionarios com uma 'acao' ('criar', 'posicionar',
+    'posicionar_aleatorio', 'atirar', 'atirar_salva' ou 'encerrar') e os seus
+    argumentos; as respostas sao dicionarios com 'ok' e os dados da acao ou a
+    mensagem de 'erro'.
+    """
+    
+    def __init__(self, tamanho=10, esparso=False):
+        """
+        Inicializa um servidor sem sessoes.
+        
+        Args:
+            tamanho (int, optional): Tamanho dos tabuleiros das novas sessoes. Padrao eh 10.
+            esparso (bool, optional): Se True, as sessoes usam TabuleiroEsparso. Padrao eh False.
+        """
+        self.__tamanho = tamanho
+        self.__esparso = esparso
+        self.__sessoes = {}
+        self.__contador = itertools.count(1)
+    
+    @property
+    def sessoes(self):
+        """Retorna as sessoes ativas por identificador."""
+        return self.__sessoes
+    
+    def criar_sessao(self, id_sessao=None, salva=False):
+        """
+        Cria uma nova sessao.
+        
+        Args:
+            id_sessao (str, optional): Identificador desejado. Padrao eh um identificador sequencial.
+            salva (bool, optional): Se True, a sessao joga no modo salva. Padrao eh False.
+        
+        Returns:
+            SessaoJogo: Sessao criada
+        
+        Raises:
+            ValueError: Se ja existe uma sessao com o identificador
+        """
+        if id_sessao is None:
+            id_sessao = f"s{next(self.__contador)}"
+        if id_sessao in self.__sessoes:
+            raise ValueError(f"Sessao ja existe: {id_sessao}")
+        sessao = SessaoJogo(id_sessao, self.__tamanho, self.__esparso, salva)
+        self.__sessoes[id_sessao] = sessao
+        return sessao
+    
+    def exportar_sessao(self, id_sessao):
+        """
+        Retira uma sessao do servidor e devolve o snapshot dela.
+        
+        Args:
+            id_sessao (str): Identificador da sessao
+        
+        Returns:
+            dict: Snapshot da sessao (SessaoJogo.para_dict())
+        
+        Raises:
+            ValueError: Se a sessao nao existe
+        """
+        sessao = self.__sessoes.pop(id_sessao, None)
+        if sessao is None:
+            raise ValueError(f"Sessao desconhecida: {id_sessao}")
+        return sessao.para_dict()
+    
+    def importar_sessao(self, dados):
+        """
+        Recria no servidor uma sessao exportada por outro.
+        
+        Args:
+            dados (dict): Snapshot da sessao
+        
+        Returns:
+            SessaoJogo: Sessao recriada
+        
+        Raises:
+            ValueError: Se ja existe uma sessao com o mesmo identificador ou o snapshot eh invalido
+        """
+        if dados['id'] in self.__sessoes:
+            raise ValueError(f"Sessao ja existe: {dados['id']}")
+        sessao = SessaoJogo.de_dict(dados)
+        self.__sessoes[sessao.id] = sessao
+        return sessao
+    
+    def executar(self, comando):
+        """
+        Executa um comando de cliente.
+        
+        Args:
+            comando (dict): Comando com a 'acao' e os seus argumentos
+        
+        Returns:
+            dict: Resposta do comando
+        """
+        if not isinstance(comando, dict):
+            return {'ok': False, 'erro': "Comando invalido."}
+        try:
+            acao = comando.get('acao')
+            if acao == 'criar':
+                return {'ok': True, 'sessao': self.criar_sessao(comando.get('sessao'), bool(comando.get('salva'))).id}
+            
+            sessao = self.__sessoes.get(comando.get('sessao'))
+            if sessao is None:
+                raise ValueError(f"Sessao desconhecida: {comando.get('sessao')}")
+            
+            if acao == 'posicionar':
+                posicionado = sessao.posicionar_navio(comando['orientacao'], int(comando['linha']), int(comando['coluna']))
+                return {'ok': True, 'posicionado': posicionado, 'pendentes': len(sessao.navios_pendentes)}
+            elif acao == 'posicionar_aleatorio':
+                sessao.posicionar_aleatoriamente()
+                return {'ok': True, 'pendentes': 0}
+            elif acao == 'atirar':
+                resposta = sessao.atirar(int(comando['linha']), int(comando['coluna']))
+                resposta['ok'] = True
+                return resposta
+            elif acao == 'atirar_salva':
+                resposta = sessao.atirar_salva([(int(linha), int(coluna)) for linha, coluna in comando['tiros']])
+                resposta['ok'] = True
+                return resposta
+            elif acao == 'encerrar':
+                del self.__sessoes[sessao.id]
+                return {'ok': True}
+            raise ValueError(f"Acao desconhecida: {acao}")
+        except (KeyError, TypeError, ValueError, OverflowError) as e:
+            # OverflowError vem de int() com coordenadas como 1e400
+            return {'ok': False, 'erro': str(e)}
+
+async def iniciar_servidor_tcp(servidor, host='127.0.0.1', porta=0, executor=None):
+    """
+    Expoe um ServidorSessoes por TCP, com um comando JSON por linha.
+    
+    Args:
+        servidor (ServidorSessoes): Servidor que executa os comandos (ou qualquer
+            objeto com o mesmo metodo executar, como um ClusterSessoes)
+        host (str, optional): Endereco de escuta. Padrao eh '127.0.0.1'.
+        porta (int, optional): Porta de escuta; 0 escolhe uma porta livre. Padrao eh 0.
+        executor (concurrent.futures.Executor, optional): Executor onde os comandos
+            rodam, para que comandos que esperam por outro processo nao travem o
+            laco de eventos. Padrao eh None (no proprio laco).
+    
+    Returns:
+        asyncio.Server: Servidor TCP em execucao
+    """
+    async def atender(leitor, escritor):
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                try:
+                    comando = json.loads(linha)
+                    if executor is None:
+                        resposta = servidor.executar(comando)
+                    else:
+                        resposta = await asyncio.get_running_loop().run_in_executor(executor, servidor.executar, comando)
+                except json.JSONDecodeError:
+                    resposta = {'ok': False, 'erro': "Comando invalido."}
+                escritor.write(json.dumps(resposta).encode() + b'\n')
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+    
+    return await asyncio.start_server(atender, host, porta)
+
+# Executa o servidor de sessoes em localhost
+if __name__ == "__main__":
+    async def principal():
+        servidor_tcp = await iniciar_servidor_tcp(ServidorSessoes(), porta=8765)
+        print("Servidor de sessoes em 127.0.0.1:8765")
+        async with servidor_tcp:
+            await servidor_tcp.serve_forever()
+    
+    asyncio.run(principal())
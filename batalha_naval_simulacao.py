@@ -0,0 +1,213 @@
+import json
+import random
+import time
+from batalha_naval_classes import TabuleiroEsparso, criar_frota_padrao, posicionar_frota_aleatoria
+from batalha_naval_estrategias import EstrategiaAleatoria, EstrategiaCacaAlvo, criar_registro_tiros
+from batalha_naval_replay import GravacaoPartida
+
+def criar_tabuleiro_aleatorio(tamanho=10):
+    """
+    Cria um tabuleiro com a frota padrao posicionada aleatoriamente.
+    
+    Args:
+        tamanho (int, optional): Tamanho do tabuleiro. Padrao eh 10.
+    
+    Returns:
+        TabuleiroEsparso: Tabuleiro pronto para receber tiros
+    """
+    tabuleiro = TabuleiroEsparso(tamanho)
+    posicionar_frota_aleatoria(tabuleiro, criar_frota_padrao())
+    return tabuleiro
+
+def simular_partida(estrategia, tabuleiro):
+    """
+    Joga uma estrategia contra um tabuleiro, sem interface, ate afundar a frota.
+    
+    Args:
+        estrategia (Estrategia): Estrategia que escolhe os tiros
+        tabuleiro (Tabuleiro): Tabuleiro alvo, com os navios ja posicionados
+    
+    Returns:
+        int: Quantidade de tiros necessarios para afundar todos os navios
+    """
+    registro = criar_registro_tiros(tabuleiro.tamanho, [navio.tamanho for navio in tabuleiro.navios])
+    visao = registro.visao
+    tiros = 0
+    
+    while not tabuleiro.todos_navios_afundados():
+        linha, coluna = estrategia.escolher_tiro(visao)
+        acertou, navio = tabuleiro.receber_tiro(linha, coluna)
+        navio_afundado = navio if acertou and navio.esta_afundado() else None
+        registro.registrar(linha, coluna, acertou, navio_afundado)
+        estrategia.registrar_resultado(visao, linha, coluna, acertou, navio_afundado)
+        tiros += 1
+    
+    return tiros
+
+def registrar_salva(estrategia, registro, tiros, resultados):
+    """
+    Repassa os resultados de uma salva ao registro e a estrategia, tiro a tiro.
+    
+    Args:
+        estrategia (Estrategia): Estrategia que escolheu a salva
+        registro (RegistroTiros): Registro dos tiros contra o oponente
+        tiros (list): Coordenadas (linha, coluna) dos tiros
+        resultados (list): Resultados de receber_salva() para esses tiros
+    """
+    visao = registro.visao
+    for (linha, coluna), (acertou, navio, afundou) in zip(tiros, resultados):
+        navio_afundado = navio if afundou else None
+        registro.registrar(linha, coluna, acertou, navio_afundado)
+        estrategia.registrar_resultado(visao, linha, coluna, acertou, navio_afundado)
+
+def simular_partida_salva(estrategia, tabuleiro, tiros_por_turno=5):
+    """
+    Joga uma estrategia contra um tabuleiro no modo salva, ate afundar a frota.
+    
+    A cada turno a estrategia escolhe todos os tiros da salva de uma vez e o
+    tabuleiro os recebe em uma unica operacao.
+    
+    Args:
+        estrategia (Estrategia): Estrategia que escolhe as salvas
+        tabuleiro (Tabuleiro): Tabuleiro alvo, com os navios ja posicionados
+        tiros_por_turno (int, optional): Tiros por salva. Padrao eh 5.
+    
+    Returns:
+        tuple: (int, int) - Turnos e tiros necessarios para afundar todos os navios
+    """
+    registro = criar_registro_tiros(tabuleiro.tamanho, [navio.tamanho for navio in tabuleiro.navios])
+    turnos = 0
+    total = 0
+    
+    while not tabuleiro.todos_navios_afundados():
+        tiros = estrategia.escolher_salva(registro.visao, tiros_por_turno)
+        registrar_salva(estrategia, registro, tiros, tabuleiro.receber_salva(tiros))
+        turnos += 1
+        total += len(tiros)
+    
+    return turnos, total
+
+def medir_estrategia(fabrica_estrategia, partidas=1000, tamanho=10, semente=None, tiros_por_turno=None):
+    """
+    Mede o desempenho de uma estrategia em varias partidas simuladas.
+    
+    Cada partida usa uma nova instancia da estrategia e um novo tabuleiro aleatorio.
+    
+    Args:
+        fabrica_estrategia (callable): Cria uma nova estrategia (por exemplo, a propria classe)
+        partidas (int, optional): Quantidade de partidas. Padrao eh 1000.
+        tamanho (int, optional): Tamanho do tabuleiro. Padrao eh 10.
+        semente (int, optional): Semente do gerador aleatorio. Padrao eh None.
+        tiros_por_turno (int, optional): Tiros por salva no modo salva. Padrao eh None (um tiro por turno).
+    
+    Returns:
+        dict: Media, minimo e maximo de tiros por vitoria, media de turnos e o tempo por tiro
+    """
+    if semente is not None:
+        random.seed(semente)
+    
+    resultados = []
+    turnos = 0
+    inicio = time.perf_counter()
+    for _ in range(partidas):
+        estrategia, tabuleiro = fabrica_estrategia(), criar_tabuleiro_aleatorio(tamanho)
+        if tiros_por_turno is None:
+            tiros = simular_partida(estrategia, tabuleiro)
+            turnos += tiros
+        else:
+            turnos_partida, tiros = simular_partida_salva(estrategia, tabuleiro, tiros_por_turno)
+            turnos += turnos_partida
+        resultados.append(tiros)
+    duracao = time.perf_counter() - inicio
+    
+    return {
+        'media': sum(resultados) / partidas,
+        'minimo': min(resultados),
+        'maximo': max(resultados),
+        'turnos': turnos / partidas,
+        'us_por_tiro': duracao / sum(resultados) * 1e6,
+    }
+
+def simular_duelo(fabrica_0, fabrica_1, tamanho=10, salva=False):
+    """
+    Joga uma partida completa entre duas estrategias, alternando os tiros.
+    
+    O jogador 0 atira primeiro. Os nomes gravados sao os nomes das fabricas
+    (por exemplo, os nomes das classes das estrategias). No modo salva, cada
+    turno tem um tiro por navio ainda nao afundado do atirador, e todos os
+    tiros da salva sao gravados em sequencia.
+    
+    Args:
+        fabrica_0 (callable): Cria a estrategia do jogador 0
+        fabrica_1 (callable): Cria a estrategia do jogador 1
+        tamanho (int, optional): Tamanho dos tabuleiros. Padrao eh 10.
+        salva (bool, optional): Se True, joga no modo salva. Padrao eh False.
+    
+    Returns:
+        GravacaoPartida: Gravacao da partida, com o vencedor definido
+    """
+    tabuleiros = (criar_tabuleiro_aleatorio(tamanho), criar_tabuleiro_aleatorio(tamanho))
+    nomes = tuple(getattr(fabrica, '__name__', str(fabrica)) for fabrica in (fabrica_0, fabrica_1))
+    gravacao = GravacaoPartida.de_tabuleiros(tabuleiros[0], tabuleiros[1], nomes)
+    
+    estrategias = (fabrica_0(), fabrica_1())
+    registros = [criar_registro_tiros(tamanho, [navio.tamanho for navio in tabuleiro.navios])
+                 for tabuleiro in reversed(tabuleiros)]
+    atirador = 0
+    while True:
+        alvo = tabuleiros[1 - atirador]
+        visao = registros[atirador].visao
+        if salva:
+            restantes = sum(1 for navio in tabuleiros[atirador].navios if not navio.esta_afundado())
+            tiros = estrategias[atirador].escolher_salva(visao, restantes)
+            registrar_salva(estrategias[atirador], registros[atirador], tiros, alvo.receber_salva(tiros))
+            for linha, coluna in tiros:
+                gravacao.registrar_tiro(atirador, linha, coluna)
+            if alvo.todos_navios_afundados():
+                gravacao.vencedor = atirador
+                return gravacao
+            atirador = 1 - atirador
+            continue
+        
+        linha, coluna = estrategias[atirador].escolher_tiro(visao)
+        acertou, navio = alvo.receber_tiro(linha, coluna)
+        navio_afundado = navio if acertou and navio.esta_afundado() else None
+        registros[atirador].registrar(linha, coluna, acertou, navio_afundado)
+        estrategias[atirador].registrar_resultado(visao, linha, coluna, acertou, navio_afundado)
+        gravacao.registrar_tiro(atirador, linha, coluna)
+        
+        if alvo.todos_navios_afundados():
+            gravacao.vencedor = atirador
+            return gravacao
+        atirador = 1 - atirador
+
+def gravar_partidas(caminho, partidas, fabricas=(EstrategiaCacaAlvo, EstrategiaAleatoria), tamanho=10):
+    """
+    Simula duelos entre pares de estrategias e grava um arquivo de partidas.
+    
+    O arquivo tem uma gravacao por linha, em JSON (GravacaoPartida.para_dict()).
+    Todos os pares ordenados de estrategias sao jogados em rodizio.
+    
+    Args:
+        caminho (str): Caminho do arquivo
+        partidas (int): Quantidade de partidas
+        fabricas (tuple, optional): Fabricas das estrategias. Padrao eh (EstrategiaCacaAlvo, EstrategiaAleatoria).
+        tamanho (int, optional): Tamanho dos tabuleiros. Padrao eh 10.
+    """
+    pares = [(a, b) for a in fabricas for b in fabricas]
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        for i in range(partidas):
+            fabrica_0, fabrica_1 = pares[i % len(pares)]
+            arquivo.write(json.dumps(simular_duelo(fabrica_0, fabrica_1, tamanho).para_dict()))
+            arquivo.write('\n')
+
+# Executa um benchmark simples das estrategias disponiveis
+if __name__ == "__main__":
+    for estrategia in (EstrategiaAleatoria, EstrategiaCacaAlvo):
+        resultado = medir_estrategia(estrategia, semente=0)
+        print(f"{estrategia.__name__}: {resultado['media']:.2f} tiros por vitoria "
+              f"(min {resultado['minimo']}, max {resultado['maximo']}, "
+              f"{resultado['us_por_tiro']:.1f} us por tiro)")
+        resultado = medir_estrategia(estrategia, semente=0, tiros_por_turno=5)
+        print(f"{estrategia.__name__} em salvas de 5: {resultado['turnos']:.2f} turnos, "
+              f"{resultado['media']:.2f} tiros por vitoria ({resultado['us_por_tiro']:.1f} us por tiro)")